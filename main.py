@@ -3,10 +3,13 @@ CognitiveScrum (OptiSprint) - Autonomous Scrum Master Application
 Streamlit-based interface for sprint planning with AI agents.
 """
 import streamlit as st
-import pandas as pd
 from typing import List, Dict
 import os
+import time
 from datetime import datetime
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from threading import Thread
 import warnings
 import logging
 
@@ -24,8 +27,14 @@ logging.getLogger("crewai.telemetry").setLevel(logging.ERROR)
 from src.config import ModelConfig
 from src.db_handler import DBHandler
 from src.agents.interview_agent import InterviewerAgent
-from src.agents.cognitive_crew import CognitiveScrumAgents
+from src.semantic_cache import SemanticCache
 from src.utils import parse_pdf, parse_csv_backlog, parse_json_backlog, extract_candidate_name, parse_sprint_plan_output
+from src.llm_cache import LLMCache, cached_generate_question
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx
+except ImportError:
+    add_script_run_ctx = None
 
 
 # Page configuration
@@ -35,12 +44,21 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_db_handler() -> DBHandler:
+    """Process-wide DBHandler so all sessions share one Chroma client."""
+    return DBHandler()
+
+
 # Initialize session state
 if "model_config" not in st.session_state:
     st.session_state.model_config = ModelConfig()
 
 if "db_handler" not in st.session_state:
-    st.session_state.db_handler = DBHandler()
+    st.session_state.db_handler = get_db_handler()
+
+if "llm_cache" not in st.session_state:
+    st.session_state.llm_cache = LLMCache()
 
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
@@ -77,15 +95,390 @@ if "base_url" not in st.session_state:
 
 
 def initialize_interviewer():
-    """Initialize the interviewer agent with current model config."""
+    """
+    Initialize the interviewer agent with current model config.
+
+    The agent (and its underlying LLM client) is cached in session state keyed
+    by the model config tuple, so Streamlit reruns reuse the same instance
+    instead of rebuilding the client on every widget interaction.
+    """
     try:
+        config_key = (
+            st.session_state.model_name,
+            st.session_state.base_url,
+            st.session_state.api_key
+        )
+
+        # Reuse cached agent if the config hasn't changed
+        if (st.session_state.get("interviewer") is not None
+                and st.session_state.get("interviewer_key") == config_key):
+            return st.session_state.interviewer
+
+        # Config changed (or first run): rebuild the agent
         st.session_state.model_config.update_from_session_state(st.session_state)
-        return InterviewerAgent(st.session_state.model_config)
+        interviewer = InterviewerAgent(
+            st.session_state.model_config,
+            semantic_cache=SemanticCache(st.session_state.db_handler.client)
+        )
+        # Check the response cache before hitting the LLM for repeated prompts
+        interviewer.generate_question = cached_generate_question(
+            interviewer,
+            st.session_state.llm_cache
+        )
+        st.session_state.interviewer = interviewer
+        st.session_state.interviewer_key = config_key
+        return st.session_state.interviewer
     except Exception as e:
         st.error(f"Failed to initialize interviewer: {str(e)}")
         return None
 
 
+@st.cache_data(show_spinner=False, max_entries=128)
+def _parse_pdf_cached(data: bytes) -> str:
+    """Parse PDF bytes, memoized by content hash so duplicate uploads are free."""
+    return parse_pdf(BytesIO(data))
+
+
+def _parse_pdf_bytes(data: bytes) -> str:
+    """Top-level PDF-bytes parser so ProcessPoolExecutor workers can pickle it."""
+    return parse_pdf(BytesIO(data))
+
+
+@st.cache_data(show_spinner=False)
+def _resume_summary_df(version: int):
+    """Candidate summary table, recomputed only when the DB version changes."""
+    import pandas as pd
+
+    rows = []
+    for resume in get_db_handler().get_all_resumes():
+        metadata = resume.get("metadata", {})
+        rows.append({
+            "Name": metadata.get("name", "Unknown"),
+            "Filename": metadata.get("filename", "N/A")
+        })
+    return pd.DataFrame(rows)
+
+
+@st.cache_data(show_spinner=False)
+def _backlog_summary_df(version: int):
+    """Backlog summary table, recomputed only when the DB version changes."""
+    import pandas as pd
+
+    rows = []
+    for item in get_db_handler().get_all_backlog():
+        metadata = item.get("metadata", {})
+        rows.append({
+            "Ticket ID": metadata.get("ticket_id", "N/A"),
+            "Complexity": metadata.get("complexity", "N/A")
+        })
+    return pd.DataFrame(rows)
+
+
+def _extract_task_outputs(crew, scheduler_task, critic_task, result):
+    """
+    Pull the scheduler and critic outputs from a finished crew run.
+
+    CrewAI stores task outputs in task.output after execution; fall back to
+    the crew's task list and finally the full result if they're unavailable.
+
+    Returns:
+        Tuple of (scheduler_output, critic_output) strings
+    """
+    result_text = None
+
+    def _full_result():
+        # str() on CrewOutput can traverse nested tasks; do it at most once
+        nonlocal result_text
+        if result_text is None:
+            result_text = str(result)
+        return result_text
+
+    try:
+        scheduler_output = str(scheduler_task.output) if hasattr(scheduler_task, 'output') and scheduler_task.output else None
+        critic_output = str(critic_task.output) if hasattr(critic_task, 'output') and critic_task.output else None
+
+        # Fallback: if outputs not available, try to extract from crew tasks
+        if not scheduler_output or not critic_output:
+            if hasattr(crew, 'tasks') and len(crew.tasks) >= 3:
+                # Scheduler and critic are always the last two tasks; staffing
+                # may fan out into several per-candidate tasks ahead of them
+                scheduler_output = str(crew.tasks[-2].output) if hasattr(crew.tasks[-2], 'output') and crew.tasks[-2].output else _full_result()
+                critic_output = str(crew.tasks[-1].output) if hasattr(crew.tasks[-1], 'output') and crew.tasks[-1].output else _full_result()
+            else:
+                # Last resort: use full result
+                scheduler_output = _full_result()
+                critic_output = _full_result()
+    except Exception as e:
+        # Fallback to full result if extraction fails
+        st.warning(f"Could not extract individual task outputs: {str(e)}. Using full result.")
+        scheduler_output = _full_result()
+        critic_output = _full_result()
+
+    return scheduler_output, critic_output
+
+
+def _get_scrum_agents():
+    """
+    Get the planning-agents instance for the current model config.
+
+    Cached in session state keyed by the model config tuple (the same scheme
+    as initialize_interviewer), so repeat planning runs reuse the instance —
+    and with it the memoized Agents and built crews — instead of rebuilding
+    everything from scratch each run.
+    """
+    # Deferred import: crewai is heavy and only needed once a plan is requested
+    from src.agents.cognitive_crew import CognitiveScrumAgents
+    from src.plan_cache import PlanCache
+
+    config_key = (
+        st.session_state.model_name,
+        st.session_state.base_url,
+        st.session_state.api_key
+    )
+    if (st.session_state.get("scrum_agents") is not None
+            and st.session_state.get("scrum_agents_key") == config_key):
+        return st.session_state.scrum_agents
+
+    plan_cache = PlanCache(st.session_state.db_handler.client)
+    scrum_agents = CognitiveScrumAgents(
+        st.session_state.model_config,
+        plan_cache=plan_cache
+    )
+    st.session_state.scrum_agents = scrum_agents
+    st.session_state.scrum_agents_key = config_key
+    return scrum_agents
+
+
+def _kickoff_planning(db_handler, scrum_agents, model_config, result_holder):
+    """
+    Run the planning crew in a background thread.
+
+    Results (or the raised exception) are written into result_holder so the
+    Streamlit script thread can poll for completion without blocking the UI.
+    """
+    try:
+        combined_context = db_handler.get_combined_context()
+
+        # Stream each completed task's output into the holder so the UI can
+        # show progress while later tasks are still running
+        def _on_task_done(task_output):
+            result_holder.setdefault("progress", []).append(str(task_output))
+
+        crew, scheduler_task, critic_task = scrum_agents.create_planning_crew(
+            combined_context,
+            task_callback=_on_task_done
+        )
+        result_holder["total_tasks"] = len(getattr(crew, "tasks", [])) or 3
+
+        # Let a local Ollama server actually execute concurrent requests
+        if model_config.base_url and "localhost" in model_config.base_url:
+            os.environ.setdefault("OLLAMA_NUM_PARALLEL", "4")
+
+        # Prefer the async kickoff when this CrewAI version exposes it, so
+        # independent LLM calls inside the crew can run concurrently
+        if hasattr(crew, "kickoff_async"):
+            import asyncio
+            result = asyncio.run(crew.kickoff_async())
+        else:
+            result = crew.kickoff()
+
+        # Store the finished plan for reuse, unless it was itself a replay
+        if not getattr(crew, "from_cache", False) and scrum_agents.plan_cache is not None:
+            try:
+                scrum_agents.plan_cache.record(
+                    combined_context,
+                    str(scheduler_task.output) if getattr(scheduler_task, "output", None) else str(result),
+                    str(critic_task.output) if getattr(critic_task, "output", None) else str(result)
+                )
+            except Exception:
+                pass  # Caching must never fail the planning run
+
+        result_holder["crew"] = crew
+        result_holder["scheduler_task"] = scheduler_task
+        result_holder["critic_task"] = critic_task
+        result_holder["result"] = result
+    except Exception as e:
+        result_holder["error"] = e
+    finally:
+        result_holder["done"] = True
+
+
+def start_plan_generation():
+    """Launch sprint-plan generation off the script thread and record its state."""
+    st.session_state.model_config.update_from_session_state(st.session_state)
+    # Resolve the cached agents on the script thread; session state is not
+    # safely accessible from the worker thread
+    scrum_agents = _get_scrum_agents()
+
+    holder = {"done": False}
+    thread = Thread(
+        target=_kickoff_planning,
+        args=(st.session_state.db_handler, scrum_agents,
+              st.session_state.model_config, holder),
+        daemon=True
+    )
+    if add_script_run_ctx:
+        add_script_run_ctx(thread)
+    thread.start()
+
+    st.session_state.plan_holder = holder
+
+
+if hasattr(st, "fragment"):
+    _fragment = st.fragment
+else:  # older Streamlit without fragments: run the panel inline
+    def _fragment(func):
+        return func
+
+
+@_fragment
+def _status_fragment():
+    """Sidebar completeness metric, scoped so full reruns can diff-skip it."""
+    st.metric("Context Completeness", f"{st.session_state.sufficiency_score}%")
+
+
+@_fragment
+def _interview_fragment(interviewer):
+    """
+    Body of the Context Interview tab.
+
+    Wrapped in st.fragment so chat submissions rerun only this panel
+    instead of the whole script (sidebar, Knowledge Base tables, etc.).
+    """
+    # Display chat history with minimized view
+    chat_container = st.container()
+    
+    with chat_container:
+        # Render only the recent messages so long interviews don't
+        # rebuild the whole history on every rerun
+        history = st.session_state.chat_history
+        show_all = st.session_state.get("show_all_history", False)
+        hidden_count = 0 if show_all else max(0, len(history) - 10)
+
+        if hidden_count:
+            if st.button(f"Show earlier messages ({hidden_count})"):
+                st.session_state.show_all_history = True
+                st.rerun()
+
+        for message in history[hidden_count:]:
+            with st.chat_message(message["role"]):
+                st.write(message["content"])
+    
+    # Context completeness indicator
+    st.divider()
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.progress(st.session_state.sufficiency_score / 100)
+    with col2:
+        st.metric("Completeness", f"{st.session_state.sufficiency_score}%")
+    
+    # Generate initial question if chat is empty
+    if not st.session_state.chat_history and not st.session_state.current_question:
+        if st.button("🎯 Start Interview"):
+            with st.spinner("Generating first question..."):
+                try:
+                    existing_context = st.session_state.db_handler.get_combined_context()
+                    result = interviewer.generate_question([], existing_context)
+                    question = result["question"]
+                    st.session_state.sufficiency_score = result["sufficiency_score"]
+                    st.session_state.ready_to_plan = result["ready_to_plan"]
+                    
+                    # Add to chat history (not as current_question to avoid duplication)
+                    st.session_state.chat_history.append({
+                        "role": "assistant",
+                        "content": question
+                    })
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error generating question: {str(e)}")
+    
+    # File upload for chat
+    uploaded_files = st.file_uploader(
+        "📎 Upload documents (PDF, TXT, DOCX) to provide context",
+        type=["pdf", "txt", "docx"],
+        accept_multiple_files=True,
+        key="chat_file_uploader"
+    )
+    
+    # Process uploaded files if any
+    uploaded_content = ""
+    if uploaded_files:
+        for file in uploaded_files:
+            try:
+                # Read the upload into memory once; getvalue() avoids
+                # re-reading the stream on reruns
+                if file.name.endswith('.pdf'):
+                    content = _parse_pdf_cached(file.getvalue())
+                    uploaded_content += f"\n\n[Document: {file.name}]\n{content}"
+                elif file.name.endswith('.txt'):
+                    content = file.getvalue().decode("utf-8")
+                    uploaded_content += f"\n\n[Document: {file.name}]\n{content}"
+                elif file.name.endswith('.docx'):
+                    # For DOCX, we'd need python-docx library
+                    st.info(f"DOCX support coming soon. Please convert {file.name} to PDF or TXT.")
+            except Exception as e:
+                st.warning(f"Could not read {file.name}: {str(e)}")
+    
+    # Chat input
+    user_input = st.chat_input("Type your answer here...")
+    
+    if user_input:
+        # Combine user input with uploaded content
+        full_user_input = user_input
+        if uploaded_content:
+            full_user_input = f"{user_input}\n\n{uploaded_content}"
+        
+        # Add user message to chat immediately
+        st.session_state.chat_history.append({
+            "role": "user",
+            "content": full_user_input
+        })
+        
+        # Save to ChromaDB
+        try:
+            st.session_state.db_handler.add_context(
+                full_user_input,
+                {"timestamp": datetime.now().isoformat(), "question": st.session_state.current_question}
+            )
+        except Exception as e:
+            st.warning(f"Could not save context: {str(e)}")
+        
+        # Set flag to generate next question
+        st.session_state.pending_question_generation = True
+        
+        # Rerun immediately to show user message
+        st.rerun()
+    
+    # Generate next question after user input is displayed
+    if st.session_state.pending_question_generation:
+        st.session_state.pending_question_generation = False
+        with st.spinner("Analyzing your answer and generating next question..."):
+            try:
+                existing_context = st.session_state.db_handler.get_combined_context()
+                result = interviewer.generate_question(
+                    st.session_state.chat_history,
+                    existing_context
+                )
+                
+                next_question = result["question"]
+                st.session_state.sufficiency_score = result["sufficiency_score"]
+                st.session_state.ready_to_plan = result["ready_to_plan"]
+                
+                # Add AI question to chat (only once, not duplicated)
+                st.session_state.chat_history.append({
+                    "role": "assistant",
+                    "content": next_question
+                })
+                
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error generating question: {str(e)}")
+    
+    # Ready to plan indicator
+    if st.session_state.ready_to_plan:
+        st.success("✅ **Context is sufficient!** You can now generate the sprint plan in the 'Sprint Plan' tab.")
+
+
 def main():
     """Main application entry point."""
     
@@ -150,15 +543,19 @@ def main():
         # Status indicators
         st.divider()
         st.header("Status")
-        st.metric("Context Completeness", f"{st.session_state.sufficiency_score}%")
+        _status_fragment()
         
-        # Count uploaded items
+        # Count uploaded items (O(1) collection counts, not full scans)
         try:
-            resumes = st.session_state.db_handler.get_all_resumes()
-            backlog_items = st.session_state.db_handler.get_all_backlog()
-            st.info(f"📄 Resumes: {len(resumes)}\n📋 Backlog Items: {len(backlog_items)}")
+            resume_count = st.session_state.db_handler.count_resumes()
+            backlog_count = st.session_state.db_handler.count_backlog()
+            st.info(f"📄 Resumes: {resume_count}\n📋 Backlog Items: {backlog_count}")
         except:
             pass
+
+        # LLM cache hit/miss stats
+        cache_stats = st.session_state.llm_cache.stats
+        st.caption(f"LLM cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
     
     # Main content area
     st.title("🚀 CognitiveScrum - Autonomous Scrum Master")
@@ -185,24 +582,55 @@ def main():
             if st.button("Process Resumes", key="process_resumes"):
                 if resume_files:
                     with st.spinner("Processing resumes..."):
-                        for resume_file in resume_files:
+                        # Parse all PDFs in parallel, then insert in one batch.
+                        # PyPDF2 extraction is CPU-bound Python, so larger
+                        # batches go to a process pool to sidestep the GIL.
+                        names = [f.name for f in resume_files]
+                        payloads = [f.getvalue() for f in resume_files]
+
+                        try:
+                            if len(payloads) > 2:
+                                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                                    texts = list(executor.map(_parse_pdf_bytes, payloads))
+                            else:
+                                # Small batches: spawn overhead isn't worth it
+                                texts = [_parse_pdf_cached(data) for data in payloads]
+                            results = [(name, text, None) for name, text in zip(names, texts)]
+                        except Exception:
+                            # Pool failed mid-batch; retry serially so one bad
+                            # PDF doesn't sink the others
+                            results = []
+                            for name, data in zip(names, payloads):
+                                try:
+                                    results.append((name, _parse_pdf_cached(data), None))
+                                except Exception as e:
+                                    results.append((name, None, e))
+
+                        parsed_texts = []
+                        parsed_metadatas = []
+
+                        for filename, resume_text, error in results:
+                            if error is not None:
+                                st.error(f"❌ Error processing {filename}: {str(error)}")
+                                continue
+                            candidate_name = extract_candidate_name(resume_text)
+                            parsed_texts.append(resume_text)
+                            parsed_metadatas.append({
+                                "name": candidate_name,
+                                "upload_date": datetime.now().isoformat(),
+                                "filename": filename
+                            })
+
+                        if parsed_texts:
                             try:
-                                resume_text = parse_pdf(resume_file)
-                                candidate_name = extract_candidate_name(resume_text)
-                                
-                                metadata = {
-                                    "name": candidate_name,
-                                    "upload_date": datetime.now().isoformat(),
-                                    "filename": resume_file.name
-                                }
-                                
-                                candidate_id = st.session_state.db_handler.add_resume(
-                                    resume_text,
-                                    metadata
+                                st.session_state.db_handler.add_resumes_bulk(
+                                    parsed_texts,
+                                    parsed_metadatas
                                 )
-                                st.success(f"✅ Processed resume: {candidate_name}")
+                                names = ", ".join(m["name"] for m in parsed_metadatas)
+                                st.success(f"✅ Processed {len(parsed_texts)} resume(s): {names}")
                             except Exception as e:
-                                st.error(f"❌ Error processing {resume_file.name}: {str(e)}")
+                                st.error(f"❌ Error storing resumes: {str(e)}")
                 else:
                     st.warning("Please upload at least one PDF file.")
         
@@ -219,30 +647,34 @@ def main():
                 if backlog_files:
                     with st.spinner("Processing backlog files..."):
                         try:
-                            total_items = 0
+                            # Collect items across all files, then insert in one batch
+                            descriptions = []
+                            metadatas = []
+                            item_ids = []
                             for backlog_file in backlog_files:
                                 if backlog_file.name.endswith('.csv'):
                                     backlog_items = parse_csv_backlog(backlog_file)
                                 else:
                                     backlog_items = parse_json_backlog(backlog_file)
-                                
+
                                 for item in backlog_items:
-                                    metadata = {
+                                    descriptions.append(item.get("description", ""))
+                                    metadatas.append({
                                         "ticket_id": item.get("ticket_id", ""),
                                         "complexity": item.get("complexity", "Medium"),
                                         "required_skills": item.get("required_skills", ""),
                                         "upload_date": datetime.now().isoformat(),
                                         "source_file": backlog_file.name
-                                    }
-                                    
-                                    item_id = st.session_state.db_handler.add_backlog_item(
-                                        item.get("description", ""),
-                                        metadata,
-                                        item.get("ticket_id")
-                                    )
-                                    total_items += 1
-                            
-                            st.success(f"✅ Processed {total_items} backlog items from {len(backlog_files)} file(s)")
+                                    })
+                                    item_ids.append(item.get("ticket_id"))
+
+                            st.session_state.db_handler.add_backlog_items_bulk(
+                                descriptions,
+                                metadatas,
+                                item_ids
+                            )
+
+                            st.success(f"✅ Processed {len(descriptions)} backlog items from {len(backlog_files)} file(s)")
                         except Exception as e:
                             st.error(f"❌ Error processing backlog: {str(e)}")
                 else:
@@ -257,16 +689,9 @@ def main():
         with col1:
             st.write("**Candidates:**")
             try:
-                resumes = st.session_state.db_handler.get_all_resumes()
-                if resumes:
-                    resume_data = []
-                    for resume in resumes:
-                        metadata = resume.get("metadata", {})
-                        resume_data.append({
-                            "Name": metadata.get("name", "Unknown"),
-                            "Filename": metadata.get("filename", "N/A")
-                        })
-                    st.dataframe(pd.DataFrame(resume_data), width='stretch')
+                resume_df = _resume_summary_df(st.session_state.db_handler.get_version())
+                if not resume_df.empty:
+                    st.dataframe(resume_df, width='stretch')
                 else:
                     st.info("No resumes uploaded yet.")
             except Exception as e:
@@ -275,16 +700,9 @@ def main():
         with col2:
             st.write("**Backlog Items:**")
             try:
-                backlog_items = st.session_state.db_handler.get_all_backlog()
-                if backlog_items:
-                    backlog_data = []
-                    for item in backlog_items:
-                        metadata = item.get("metadata", {})
-                        backlog_data.append({
-                            "Ticket ID": metadata.get("ticket_id", "N/A"),
-                            "Complexity": metadata.get("complexity", "N/A")
-                        })
-                    st.dataframe(pd.DataFrame(backlog_data), width='stretch')
+                backlog_df = _backlog_summary_df(st.session_state.db_handler.get_version())
+                if not backlog_df.empty:
+                    st.dataframe(backlog_df, width='stretch')
                 else:
                     st.info("No backlog items uploaded yet.")
             except Exception as e:
@@ -301,129 +719,7 @@ def main():
         if not interviewer:
             st.error("Please configure LLM settings in the sidebar and test the connection.")
         else:
-            # Display chat history with minimized view
-            chat_container = st.container()
-            
-            with chat_container:
-                # Show chat history in minimized expanders
-                for idx, message in enumerate(st.session_state.chat_history):
-                    role_icon = "👤" if message["role"] == "user" else "🤖"
-                    role_label = "You" if message["role"] == "user" else "AI Assistant"
-                    
-                    with st.expander(f"{role_icon} {role_label}", expanded=False):
-                        st.write(message["content"])
-            
-            # Context completeness indicator
-            st.divider()
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.progress(st.session_state.sufficiency_score / 100)
-            with col2:
-                st.metric("Completeness", f"{st.session_state.sufficiency_score}%")
-            
-            # Generate initial question if chat is empty
-            if not st.session_state.chat_history and not st.session_state.current_question:
-                if st.button("🎯 Start Interview"):
-                    with st.spinner("Generating first question..."):
-                        try:
-                            existing_context = st.session_state.db_handler.get_combined_context()
-                            result = interviewer.generate_question([], existing_context)
-                            question = result["question"]
-                            st.session_state.sufficiency_score = result["sufficiency_score"]
-                            st.session_state.ready_to_plan = result["ready_to_plan"]
-                            
-                            # Add to chat history (not as current_question to avoid duplication)
-                            st.session_state.chat_history.append({
-                                "role": "assistant",
-                                "content": question
-                            })
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error generating question: {str(e)}")
-            
-            # File upload for chat
-            uploaded_files = st.file_uploader(
-                "📎 Upload documents (PDF, TXT, DOCX) to provide context",
-                type=["pdf", "txt", "docx"],
-                accept_multiple_files=True,
-                key="chat_file_uploader"
-            )
-            
-            # Process uploaded files if any
-            uploaded_content = ""
-            if uploaded_files:
-                for file in uploaded_files:
-                    try:
-                        if file.name.endswith('.pdf'):
-                            content = parse_pdf(file)
-                            uploaded_content += f"\n\n[Document: {file.name}]\n{content}"
-                        elif file.name.endswith('.txt'):
-                            content = str(file.read(), "utf-8")
-                            uploaded_content += f"\n\n[Document: {file.name}]\n{content}"
-                        elif file.name.endswith('.docx'):
-                            # For DOCX, we'd need python-docx library
-                            st.info(f"DOCX support coming soon. Please convert {file.name} to PDF or TXT.")
-                    except Exception as e:
-                        st.warning(f"Could not read {file.name}: {str(e)}")
-            
-            # Chat input
-            user_input = st.chat_input("Type your answer here...")
-            
-            if user_input:
-                # Combine user input with uploaded content
-                full_user_input = user_input
-                if uploaded_content:
-                    full_user_input = f"{user_input}\n\n{uploaded_content}"
-                
-                # Add user message to chat immediately
-                st.session_state.chat_history.append({
-                    "role": "user",
-                    "content": full_user_input
-                })
-                
-                # Save to ChromaDB
-                try:
-                    st.session_state.db_handler.add_context(
-                        full_user_input,
-                        {"timestamp": datetime.now().isoformat(), "question": st.session_state.current_question}
-                    )
-                except Exception as e:
-                    st.warning(f"Could not save context: {str(e)}")
-                
-                # Set flag to generate next question
-                st.session_state.pending_question_generation = True
-                
-                # Rerun immediately to show user message
-                st.rerun()
-            
-            # Generate next question after user input is displayed
-            if st.session_state.pending_question_generation:
-                st.session_state.pending_question_generation = False
-                with st.spinner("Analyzing your answer and generating next question..."):
-                    try:
-                        existing_context = st.session_state.db_handler.get_combined_context()
-                        result = interviewer.generate_question(
-                            st.session_state.chat_history,
-                            existing_context
-                        )
-                        
-                        next_question = result["question"]
-                        st.session_state.sufficiency_score = result["sufficiency_score"]
-                        st.session_state.ready_to_plan = result["ready_to_plan"]
-                        
-                        # Add AI question to chat (only once, not duplicated)
-                        st.session_state.chat_history.append({
-                            "role": "assistant",
-                            "content": next_question
-                        })
-                        
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error generating question: {str(e)}")
-            
-            # Ready to plan indicator
-            if st.session_state.ready_to_plan:
-                st.success("✅ **Context is sufficient!** You can now generate the sprint plan in the 'Sprint Plan' tab.")
+            _interview_fragment(interviewer)
     
     # Tab 3: Sprint Plan
     with tab3:
@@ -433,56 +729,53 @@ def main():
             st.warning("⚠️ Please complete the Context Interview first. Context completeness must be at least 80%.")
             st.info("Go to the 'Context Interview' tab to answer questions and gather project context.")
         else:
+            plan_holder = st.session_state.get("plan_holder")
+            plan_running = plan_holder is not None and not plan_holder.get("done")
+
+            if plan_running:
+                # Poll the background thread; other tabs and sidebar stay responsive
+                st.info("🤖 AI agents are working... This may take a few minutes.")
+
+                # Show intermediate task outputs as they complete
+                progress = plan_holder.get("progress", [])
+                if progress:
+                    total_tasks = plan_holder.get("total_tasks", 3)
+                    with st.expander(f"Agent progress ({len(progress)}/{total_tasks} tasks done)", expanded=True):
+                        st.markdown("\n\n---\n\n".join(progress))
+
+                time.sleep(1)
+                st.rerun()
+            elif plan_holder is not None:
+                # Thread finished: collect outputs once, then clear the holder
+                st.session_state.plan_holder = None
+
+                error = plan_holder.get("error")
+                if error is not None:
+                    st.error(f"❌ Error generating sprint plan: {str(error)}")
+                    st.exception(error)
+                else:
+                    scheduler_output, critic_output = _extract_task_outputs(
+                        plan_holder["crew"],
+                        plan_holder["scheduler_task"],
+                        plan_holder["critic_task"],
+                        plan_holder["result"]
+                    )
+
+                    # Parse scheduler output for table (this contains the task assignments)
+                    task_df, _ = parse_sprint_plan_output(scheduler_output)
+
+                    # Store results
+                    st.session_state.sprint_plan = critic_output  # Full report from critic
+                    st.session_state.sprint_plan_table = task_df  # Table from scheduler
+                    st.session_state.sprint_plan_full_text = critic_output  # Critic's validation report
+
+                    st.success("✅ Sprint plan generated successfully!")
+
             # Generate sprint plan button
-            if st.button("🚀 Generate Sprint Plan", type="primary", width='stretch'):
-                with st.spinner("🤖 AI agents are working... This may take a few minutes."):
-                    try:
-                        # Get combined context
-                        combined_context = st.session_state.db_handler.get_combined_context()
-                        
-                        # Initialize agents
-                        st.session_state.model_config.update_from_session_state(st.session_state)
-                        scrum_agents = CognitiveScrumAgents(st.session_state.model_config)
-                        
-                        # Create and run crew
-                        crew, scheduler_task, critic_task = scrum_agents.create_planning_crew(combined_context)
-                        result = crew.kickoff()
-                        
-                        # Extract individual task outputs
-                        # CrewAI stores task outputs in task.output after execution
-                        try:
-                            scheduler_output = str(scheduler_task.output) if hasattr(scheduler_task, 'output') and scheduler_task.output else None
-                            critic_output = str(critic_task.output) if hasattr(critic_task, 'output') and critic_task.output else None
-                            
-                            # Fallback: if outputs not available, try to extract from crew tasks
-                            if not scheduler_output or not critic_output:
-                                if hasattr(crew, 'tasks') and len(crew.tasks) >= 3:
-                                    scheduler_output = str(crew.tasks[1].output) if hasattr(crew.tasks[1], 'output') and crew.tasks[1].output else str(result)
-                                    critic_output = str(crew.tasks[2].output) if hasattr(crew.tasks[2], 'output') and crew.tasks[2].output else str(result)
-                                else:
-                                    # Last resort: use full result
-                                    scheduler_output = str(result)
-                                    critic_output = str(result)
-                        except Exception as e:
-                            # Fallback to full result if extraction fails
-                            st.warning(f"Could not extract individual task outputs: {str(e)}. Using full result.")
-                            scheduler_output = str(result)
-                            critic_output = str(result)
-                        
-                        # Parse scheduler output for table (this contains the task assignments)
-                        task_df, _ = parse_sprint_plan_output(scheduler_output)
-                        
-                        # Store results
-                        st.session_state.sprint_plan = critic_output  # Full report from critic
-                        st.session_state.sprint_plan_table = task_df  # Table from scheduler
-                        st.session_state.sprint_plan_full_text = critic_output  # Critic's validation report
-                        
-                        st.success("✅ Sprint plan generated successfully!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"❌ Error generating sprint plan: {str(e)}")
-                        st.exception(e)
-            
+            if not plan_running and st.button("🚀 Generate Sprint Plan", type="primary", width='stretch'):
+                start_plan_generation()
+                st.rerun()
+
             # Display sprint plan if exists
             if st.session_state.sprint_plan:
                 st.divider()
@@ -527,47 +820,16 @@ def main():
                                 f"CORRECTION: {correction_text}",
                                 {"type": "correction", "timestamp": datetime.now().isoformat()}
                             )
-                            
+
                             # Add to chat history
                             st.session_state.chat_history.append({
                                 "role": "user",
                                 "content": f"Correction: {correction_text}"
                             })
-                            
-                            # Re-generate plan
-                            with st.spinner("Re-generating plan with corrections..."):
-                                combined_context = st.session_state.db_handler.get_combined_context()
-                                st.session_state.model_config.update_from_session_state(st.session_state)
-                                scrum_agents = CognitiveScrumAgents(st.session_state.model_config)
-                                crew, scheduler_task, critic_task = scrum_agents.create_planning_crew(combined_context)
-                                result = crew.kickoff()
-                                
-                                # Extract individual task outputs
-                                try:
-                                    scheduler_output = str(scheduler_task.output) if hasattr(scheduler_task, 'output') and scheduler_task.output else None
-                                    critic_output = str(critic_task.output) if hasattr(critic_task, 'output') and critic_task.output else None
-                                    
-                                    # Fallback: if outputs not available, try to extract from crew tasks
-                                    if not scheduler_output or not critic_output:
-                                        if hasattr(crew, 'tasks') and len(crew.tasks) >= 3:
-                                            scheduler_output = str(crew.tasks[1].output) if hasattr(crew.tasks[1], 'output') and crew.tasks[1].output else str(result)
-                                            critic_output = str(crew.tasks[2].output) if hasattr(crew.tasks[2], 'output') and crew.tasks[2].output else str(result)
-                                        else:
-                                            scheduler_output = str(result)
-                                            critic_output = str(result)
-                                except Exception as e:
-                                    scheduler_output = str(result)
-                                    critic_output = str(result)
-                                
-                                # Parse scheduler output for table
-                                task_df, _ = parse_sprint_plan_output(scheduler_output)
-                                
-                                # Store results
-                                st.session_state.sprint_plan = critic_output
-                                st.session_state.sprint_plan_table = task_df
-                                st.session_state.sprint_plan_full_text = critic_output
-                                st.success("✅ Plan updated with corrections!")
-                                st.rerun()
+
+                            # Re-generate plan in the background with updated context
+                            start_plan_generation()
+                            st.rerun()
                         except Exception as e:
                             st.error(f"Error applying corrections: {str(e)}")
                     else:
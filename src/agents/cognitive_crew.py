@@ -5,136 +5,293 @@ Includes the congnitive scrum crew (Staffing Expert, Scheduler, Critic).
 from crewai import Agent, Crew, Process, Task
 from typing import List, Dict, Optional
 from src.config import ModelConfig
+from src.plan_cache import CachedPlanCrew, CachedPlanTask
+
+
+# Agent definitions are fully static apart from the bound LLM; keep their
+# role/goal/backstory strings assembled once at import so every Agent build
+# (and CrewAI's templating of them) starts from the same interned literals.
+_AGENT_SPECS = {
+    "staffing": dict(
+        role='Staffing Expert',
+        goal='Match team member skills from resumes to backlog items based on semantic similarity and expertise.',
+        backstory=(
+            "You are an expert HR and technical recruiter with 15 years of experience. "
+            "You analyze resumes deeply, extracting not just explicit skills but also "
+            "inferred capabilities from experience. You match these to backlog items with "
+            "precision, considering both technical skills and seniority levels. "
+            "You provide clear reasoning traces for each match."
+        ),
+        allow_delegation=False
+    ),
+    "scheduler": dict(
+        role='Sprint Scheduler',
+        goal='Create an optimal sprint schedule assigning tasks to team members based on capacity, skills, and seniority.',
+        backstory=(
+            "You are a veteran Scrum Master with 20 years of experience managing agile teams. "
+            "You calculate capacity granularly, ensuring no one is overloaded. "
+            "You respect seniority: Junior developers need 1.5x time for complex tasks. "
+            "You balance workload evenly and consider dependencies. "
+            "You always provide time estimates and risk assessments."
+        ),
+        allow_delegation=False
+    ),
+    "critic": dict(
+        role='Guardrail Auditor',
+        goal='Validate the sprint schedule for feasibility, logic, and absence of hallucinations.',
+        backstory=(
+            "You are a skeptical, detail-oriented auditor. You review sprint plans with "
+            "a critical eye, checking for: impossible deadlines, skill mismatches, "
+            "capacity overloads, missing dependencies, and any 'hallucinated' assignments "
+            "that don't match the actual team capabilities. "
+            "You demand reasoning traces for every assignment and flag risks immediately."
+        ),
+        allow_delegation=True
+    ),
+}
+
+# Static task description templates, assembled once at import. Only the
+# combined context varies between planning calls.
+_TASK1_STAFFING_TMPL = (
+    "Analyze the following project context and team resumes:\n\n{ctx}\n\n"
+    "Your task:\n"
+    "1. Extract all team member skills and seniority levels from resumes\n"
+    "2. Extract all backlog items with their required skills and complexity\n"
+    "3. Match each backlog item to the best-suited team member(s) based on skills\n"
+    "4. Provide reasoning traces for each match (e.g., 'John assigned to T-101 because he has 5 years FastAPI experience')\n\n"
+    "Output format: A structured analysis mapping backlog items to potential assignees with reasoning."
+)
+_TASK1_STAFFING_OUT = "A structured mapping of backlog items to team members with detailed reasoning traces."
+
+# Per-candidate variant used when the resume section splits cleanly; these
+# tasks are independent and run with async_execution so the LLM calls overlap
+_TASK1_STAFFING_SINGLE_TMPL = (
+    "Analyze ONE team member's resume against the project backlog.\n\n"
+    "CANDIDATE RESUME:\n{candidate}\n\n"
+    "PROJECT CONTEXT AND BACKLOG:\n{ctx}\n\n"
+    "Your task:\n"
+    "1. Extract this candidate's skills and seniority level from the resume\n"
+    "2. Identify which backlog items this candidate is well suited for\n"
+    "3. Provide reasoning traces for each match (e.g., 'John suits T-101 because he has 5 years FastAPI experience')\n\n"
+    "Output format: A structured analysis of the backlog items this candidate could take, with reasoning."
+)
+
+_TASK2_SCHEDULING_DESC = (
+    "Using the staffing analysis from the previous task, create a detailed sprint schedule.\n\n"
+    "Requirements:\n"
+    "- Assign each backlog item to a specific team member\n"
+    "- Estimate hours for each task (consider complexity and seniority)\n"
+    "- Calculate total capacity per team member (assume 40 hours/week, adjust for availability)\n"
+    "- Ensure no one is overloaded\n"
+    "- Include risk assessment (Low/Medium/High) for each assignment\n\n"
+    "CRITICAL: Output MUST be in a markdown table format with the following columns:\n"
+    "| Task_ID | Assignee | Estimated_Hours | Risk_Level | Reasoning_Trace |\n"
+    "|---------|----------|-----------------|------------|------------------|\n"
+    "| T-101   | John Doe | 8               | Low        | ...              |\n\n"
+    "This table format is essential for proper parsing and display."
+)
+_TASK2_SCHEDULING_OUT = (
+    "A markdown table with columns: Task_ID, Assignee, Estimated_Hours, Risk_Level, Reasoning_Trace. "
+    "Each row represents one task assignment."
+)
+
+_TASK3_CRITIQUE_DESC = (
+    "Review the sprint schedule from the previous task. Validate:\n"
+    "1. Are all assignments feasible given team member skills?\n"
+    "2. Are time estimates realistic?\n"
+    "3. Is anyone overloaded (exceeding capacity)?\n"
+    "4. Are there any hallucinations (assignments that don't match actual skills)?\n"
+    "5. Are dependencies considered?\n\n"
+    "Provide a final validation report with any flagged issues or approval."
+)
+_TASK3_CRITIQUE_OUT = "A validation report with approval status and any flagged risks or issues."
+
+
+def _split_staffing_contexts(combined_context: str):
+    """
+    Split the combined context into per-candidate resume blocks plus the
+    shared remainder (backlog + interview context).
+
+    Returns ([], combined_context) when the resume section can't be split,
+    in which case the caller falls back to one monolithic staffing task.
+    """
+    marker = "=== RESUME DATA ==="
+    start = combined_context.find(marker)
+    if start == -1:
+        return [], combined_context
+
+    body_start = start + len(marker)
+    next_header = combined_context.find("\n=== ", body_start)
+    if next_header == -1:
+        resume_section = combined_context[body_start:]
+        shared = combined_context[:start]
+    else:
+        resume_section = combined_context[body_start:next_header]
+        shared = combined_context[:start] + combined_context[next_header:]
+
+    # Every stored 500-char chunk carries its own "Candidate: <name>" header
+    # (see DBHandler.get_combined_context), so chunks must be regrouped by
+    # candidate first — otherwise the fan-out is one task per chunk, not per
+    # person, each seeing a fragment mislabeled as a whole resume
+    grouped = {}
+    for piece in resume_section.split("\nCandidate: "):
+        piece = piece.strip()
+        if not piece:
+            continue
+        name, _, body = piece.partition("\n")
+        grouped.setdefault(name.strip(), []).append(body.strip())
+
+    blocks = [
+        f"Candidate: {name}\n" + "\n".join(bodies)
+        for name, bodies in grouped.items()
+    ]
+    return blocks, shared.strip()
 
 
 class CognitiveScrumAgents:
     """CrewAI Agents for Sprint Planning."""
-    
-    def __init__(self, model_config: ModelConfig):
+
+    def __init__(self, model_config: ModelConfig, llm=None, plan_cache=None):
         self.model_config = model_config
-        self.llm = model_config.get_llm()
-    
+        # Reuse an injected client when provided; otherwise share the one
+        # cached on the ModelConfig so agents don't each open their own pool
+        self.llm = llm if llm is not None else model_config.get_llm()
+        # Optional PlanCache; repeat planning requests replay or adapt a
+        # previously generated plan instead of re-running all three agents
+        self.plan_cache = plan_cache
+        # Agents and built crews are cached; Agent construction triggers
+        # validation/templating in CrewAI that we only want to pay once
+        self._agents = None
+        self._crew_cache = {}
+        self._task_cb = None
+
     def staffing_expert_agent(self):
         """Agent 1: Maps skills from resumes to backlog items."""
-        return Agent(
-            role='Staffing Expert',
-            goal='Match team member skills from resumes to backlog items based on semantic similarity and expertise.',
-            backstory=(
-                "You are an expert HR and technical recruiter with 15 years of experience. "
-                "You analyze resumes deeply, extracting not just explicit skills but also "
-                "inferred capabilities from experience. You match these to backlog items with "
-                "precision, considering both technical skills and seniority levels. "
-                "You provide clear reasoning traces for each match."
-            ),
-            allow_delegation=False,
-            verbose=True,
-            llm=self.llm
-        )
-    
+        return Agent(verbose=True, llm=self.llm, **_AGENT_SPECS["staffing"])
+
     def scheduler_agent(self):
         """Agent 2: Assigns tasks based on capacity and seniority."""
-        return Agent(
-            role='Sprint Scheduler',
-            goal='Create an optimal sprint schedule assigning tasks to team members based on capacity, skills, and seniority.',
-            backstory=(
-                "You are a veteran Scrum Master with 20 years of experience managing agile teams. "
-                "You calculate capacity granularly, ensuring no one is overloaded. "
-                "You respect seniority: Junior developers need 1.5x time for complex tasks. "
-                "You balance workload evenly and consider dependencies. "
-                "You always provide time estimates and risk assessments."
-            ),
-            allow_delegation=False,
-            verbose=True,
-            llm=self.llm
-        )
-    
+        return Agent(verbose=True, llm=self.llm, **_AGENT_SPECS["scheduler"])
+
     def critic_agent(self):
         """Agent 3: Validates the plan for hallucinations and feasibility."""
-        return Agent(
-            role='Guardrail Auditor',
-            goal='Validate the sprint schedule for feasibility, logic, and absence of hallucinations.',
-            backstory=(
-                "You are a skeptical, detail-oriented auditor. You review sprint plans with "
-                "a critical eye, checking for: impossible deadlines, skill mismatches, "
-                "capacity overloads, missing dependencies, and any 'hallucinated' assignments "
-                "that don't match the actual team capabilities. "
-                "You demand reasoning traces for every assignment and flag risks immediately."
-            ),
-            allow_delegation=True,
-            verbose=True,
-            llm=self.llm
-        )
-    
-    def create_planning_crew(self, combined_context: str) -> tuple:
+        return Agent(verbose=True, llm=self.llm, **_AGENT_SPECS["critic"])
+
+    def _get_agents(self):
+        """Build the three agents once and reuse them across planning calls."""
+        if self._agents is None:
+            self._agents = (
+                self.staffing_expert_agent(),
+                self.scheduler_agent(),
+                self.critic_agent()
+            )
+        return self._agents
+
+    def _dispatch_task_callback(self, task_output):
+        """Stable callback handed to Crew; forwards to the current consumer."""
+        if self._task_cb is not None:
+            self._task_cb(task_output)
+
+    def create_planning_crew(self, combined_context: str, task_callback=None) -> tuple:
         """
         Create and configure the CrewAI crew for sprint planning.
-        
+
+        Agents are built once per instance, and the assembled crew is reused
+        when the combined context is unchanged between calls.
+
         Args:
             combined_context: Combined context from ChromaDB (resumes, backlog, project context)
-            
+            task_callback: Optional callable invoked with each task's output as
+                it completes, used to stream progress to the UI
+
         Returns:
             Tuple of (Crew object, scheduler_task, critic_task) for accessing individual outputs
         """
+        self._task_cb = task_callback
+
+        cache_key = hash(combined_context)
+        cached = self._crew_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Consult the plan cache: replay outright only for a byte-identical
+        # context (exact hash tier); a merely close embedding may hide real
+        # differences — e.g. an appended correction line past the embedder's
+        # truncation window — so those plans are only offered to the
+        # scheduler as an adaptation template
+        prior_plan = None
+        if self.plan_cache is not None:
+            try:
+                hit = self.plan_cache.lookup(combined_context)
+            except Exception:
+                hit = None
+            if hit is not None:
+                payload, distance, exact = hit
+                if exact:
+                    return (
+                        CachedPlanCrew(payload),
+                        CachedPlanTask(payload.get("scheduler_output", "")),
+                        CachedPlanTask(payload.get("critic_output", ""))
+                    )
+                prior_plan = payload.get("scheduler_output")
+
         # Initialize agents
-        staffing_expert = self.staffing_expert_agent()
-        scheduler = self.scheduler_agent()
-        critic = self.critic_agent()
-        
-        # Create tasks
-        task1_staffing = Task(
-            description=(
-                f"Analyze the following project context and team resumes:\n\n{combined_context}\n\n"
-                "Your task:\n"
-                "1. Extract all team member skills and seniority levels from resumes\n"
-                "2. Extract all backlog items with their required skills and complexity\n"
-                "3. Match each backlog item to the best-suited team member(s) based on skills\n"
-                "4. Provide reasoning traces for each match (e.g., 'John assigned to T-101 because he has 5 years FastAPI experience')\n\n"
-                "Output format: A structured analysis mapping backlog items to potential assignees with reasoning."
-            ),
-            agent=staffing_expert,
-            expected_output="A structured mapping of backlog items to team members with detailed reasoning traces."
-        )
-        
+        staffing_expert, scheduler, critic = self._get_agents()
+
+        # Staffing is embarrassingly parallel per candidate: fan out one
+        # async task per resume block and let the scheduler join on all of
+        # them via task context. Single-candidate (or unsplittable) contexts
+        # keep the original monolithic task.
+        resume_blocks, shared_context = _split_staffing_contexts(combined_context)
+        if len(resume_blocks) > 1:
+            staffing_tasks = [
+                Task(
+                    description=_TASK1_STAFFING_SINGLE_TMPL.format(
+                        candidate=block, ctx=shared_context),
+                    agent=staffing_expert,
+                    expected_output=_TASK1_STAFFING_OUT,
+                    async_execution=True
+                )
+                for block in resume_blocks
+            ]
+        else:
+            staffing_tasks = [Task(
+                description=_TASK1_STAFFING_TMPL.format(ctx=combined_context),
+                agent=staffing_expert,
+                expected_output=_TASK1_STAFFING_OUT
+            )]
+
+        task2_description = _TASK2_SCHEDULING_DESC
+        if prior_plan:
+            task2_description += (
+                f"\n\nPRIOR_PLAN (from a very similar project state):\n{prior_plan}\n\n"
+                "Adapt this prior plan to the current staffing analysis instead of "
+                "regenerating from scratch; only change assignments that no longer fit."
+            )
+
         task2_scheduling = Task(
-            description=(
-                "Using the staffing analysis from the previous task, create a detailed sprint schedule.\n\n"
-                "Requirements:\n"
-                "- Assign each backlog item to a specific team member\n"
-                "- Estimate hours for each task (consider complexity and seniority)\n"
-                "- Calculate total capacity per team member (assume 40 hours/week, adjust for availability)\n"
-                "- Ensure no one is overloaded\n"
-                "- Include risk assessment (Low/Medium/High) for each assignment\n\n"
-                "CRITICAL: Output MUST be in a markdown table format with the following columns:\n"
-                "| Task_ID | Assignee | Estimated_Hours | Risk_Level | Reasoning_Trace |\n"
-                "|---------|----------|-----------------|------------|------------------|\n"
-                "| T-101   | John Doe | 8               | Low        | ...              |\n\n"
-                "This table format is essential for proper parsing and display."
-            ),
+            description=task2_description,
             agent=scheduler,
-            expected_output="A markdown table with columns: Task_ID, Assignee, Estimated_Hours, Risk_Level, Reasoning_Trace. Each row represents one task assignment."
+            expected_output=_TASK2_SCHEDULING_OUT,
+            context=staffing_tasks
         )
-        
+
         task3_critique = Task(
-            description=(
-                "Review the sprint schedule from the previous task. Validate:\n"
-                "1. Are all assignments feasible given team member skills?\n"
-                "2. Are time estimates realistic?\n"
-                "3. Is anyone overloaded (exceeding capacity)?\n"
-                "4. Are there any hallucinations (assignments that don't match actual skills)?\n"
-                "5. Are dependencies considered?\n\n"
-                "Provide a final validation report with any flagged issues or approval."
-            ),
+            description=_TASK3_CRITIQUE_DESC,
             agent=critic,
-            expected_output="A validation report with approval status and any flagged risks or issues."
+            expected_output=_TASK3_CRITIQUE_OUT
         )
-        
+
         # Create crew
         crew = Crew(
             agents=[staffing_expert, scheduler, critic],
-            tasks=[task1_staffing, task2_scheduling, task3_critique],
+            tasks=[*staffing_tasks, task2_scheduling, task3_critique],
             process=Process.sequential,
-            verbose=True
+            verbose=True,
+            task_callback=self._dispatch_task_callback
         )
-        
+
         # Return crew and task references for accessing individual outputs
-        return crew, task2_scheduling, task3_critique
+        result = (crew, task2_scheduling, task3_critique)
+        self._crew_cache = {cache_key: result}
+        return result
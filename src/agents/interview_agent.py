@@ -1,22 +1,141 @@
-from crewai import Agent, Crew, Process, Task
+import re
+
 from typing import List, Dict, Optional
 from src.config import ModelConfig
 
+try:
+    from langchain_core.messages import HumanMessage, SystemMessage
+except ImportError:
+    HumanMessage = SystemMessage = None
+
+# Static prompt preamble: role, rules, and response format. Kept byte-for-byte
+# identical between turns (and ahead of all dynamic text) so providers with
+# KV prefix caching skip re-prefilling it on every interview turn.
+_STATIC_PROMPT_PREFIX = """You are an expert Scrum Master conducting a discovery interview to gather PROJECT REQUIREMENTS ONLY.
+
+IMPORTANT: Do NOT ask about the team members, their skills, or team composition.
+Team information will be provided separately through resume uploads.
+Focus ONLY on the PROJECT itself.
+
+Your task:
+1. Analyze what PROJECT information is still missing (deadlines, tech stack, project priorities, scope, constraints, etc.)
+2. Generate ONE specific, focused question about the PROJECT to fill the most critical gap
+3. Assess context completeness (0-100%): How much do we know about:
+- Project deadlines and timeline
+- Technical requirements and technology stack
+- Project priorities and scope
+- Resource limitations and constraints
+- Business requirements and objectives
+
+DO NOT ask about:
+- Team members or their skills
+- Team composition or availability
+- Individual capabilities
+
+Respond in this EXACT format:
+QUESTION: [your question here]
+SUFFICIENCY_SCORE: [0-100]
+READY_TO_PLAN: [true/false] (true if score >= 80)
+
+If READY_TO_PLAN is true, the question can be "All context gathered. Ready to generate sprint plan."
+"""
+
+# Known chat roles pre-uppercased; anything else falls back to .upper()
+_UP = {"user": "USER", "assistant": "ASSISTANT", "system": "SYSTEM"}
+
+# Turns kept verbatim at the end of the prompt; anything older is folded
+# into a rolling summary so prompt size stays bounded over long interviews
+_VERBATIM_TURNS = 6
+
+_SUMMARY_PROMPT_TMPL = (
+    "Condense the following interview exchange into a short factual summary "
+    "of the PROJECT information gathered so far (deadlines, tech stack, "
+    "priorities, scope, constraints). Plain prose, no commentary.\n\n{turns}"
+)
+
+# Rolling variant: folds only the newly aged-out turns into the previous
+# summary, so each fold's prompt stays small regardless of interview length
+_SUMMARY_ROLL_TMPL = (
+    "Update the existing summary with the new interview exchange below, "
+    "keeping it a short factual summary of the PROJECT information gathered "
+    "so far (deadlines, tech stack, priorities, scope, constraints). "
+    "Plain prose, no commentary.\n\n"
+    "EXISTING SUMMARY:\n{summary}\n\n"
+    "NEW EXCHANGE:\n{turns}"
+)
+
+# Single-pass extraction of the three response fields, compiled once
+_RESP_RE = re.compile(
+    r'QUESTION:\s*(.*?)\s*$.*?SUFFICIENCY_SCORE:\s*(\d+).*?READY_TO_PLAN:\s*(true|false)',
+    re.DOTALL | re.IGNORECASE | re.MULTILINE
+)
+
 class InterviewerAgent:
     """
     Lightweight interviewer agent that asks questions and determines context sufficiency.
     This is not a CrewAI agent, but a simple LLM-based function.
     """
     
-    def __init__(self, model_config: ModelConfig):
+    def __init__(self, model_config: ModelConfig, llm=None, semantic_cache=None):
         self.model_config = model_config
-        self.llm = model_config.get_llm()
-    
+        # Reuse an injected client when provided; otherwise share the one
+        # cached on the ModelConfig so agents don't each open their own pool
+        self.llm = llm if llm is not None else model_config.get_llm()
+        # Optional SemanticCache; near-duplicate turns skip the LLM entirely
+        self.semantic_cache = semantic_cache
+        # Rolling summary of turns older than the verbatim window, plus how
+        # many of those turns have been folded in; each new turn only folds
+        # the freshly aged-out messages instead of resummarizing everything
+        self._summary = ""
+        self._summary_count = 0
+
+    def _summarize_older_turns(self, older: List[Dict]) -> str:
+        """
+        Fold turns that fell out of the verbatim window into the rolling
+        summary. Only the turns not yet folded are sent to the LLM, together
+        with the previous summary, so the fold prompt stays small however
+        long the interview runs. Returns the current summary; on failure the
+        previous summary is returned and the unfolded turns retry next turn.
+        """
+        if len(older) < self._summary_count:
+            # Chat history was reset or rewritten; start the summary over
+            self._summary = ""
+            self._summary_count = 0
+        if len(older) == self._summary_count:
+            return self._summary
+
+        turns_text = "".join(
+            f"{_UP.get(msg.get('role', 'user')) or msg.get('role', 'user').upper()}: "
+            f"{msg.get('content', '')}\n"
+            for msg in older[self._summary_count:]
+        )
+        if self._summary:
+            prompt = _SUMMARY_ROLL_TMPL.format(summary=self._summary, turns=turns_text)
+        else:
+            prompt = _SUMMARY_PROMPT_TMPL.format(turns=turns_text)
+        try:
+            response = self.llm.invoke(prompt)
+            self._summary = (
+                response.content if hasattr(response, 'content') else str(response)
+            ).strip()
+            self._summary_count = len(older)
+        except Exception:
+            pass  # keep prior state; the unfolded turns retry next turn
+
+        return self._summary
+
     def generate_question(self, chat_history: List[Dict], existing_context: str = "") -> Dict:
         """
         Generate the next question based on chat history.
         Returns a dict with 'question' and 'sufficiency_score' (0-100).
-        
+
+        The sufficiency score, readiness flag, and next question are all
+        requested in one batched prompt so each interview turn costs one
+        LLM round-trip — keep it that way when editing the prompt. The one
+        sanctioned exception is the rolling-summary fold: once history
+        exceeds the verbatim window, _summarize_older_turns makes a small
+        extra call whenever turns age out of it.
+
         Args:
             chat_history: List of dicts with 'role' and 'content'
             existing_context: Existing project context from ChromaDB
@@ -24,81 +143,115 @@ class InterviewerAgent:
         Returns:
             Dict with 'question', 'sufficiency_score', and 'ready_to_plan' boolean
         """
-        # Build conversation context
-        conversation_text = ""
-        for msg in chat_history:
-            role = msg.get('role', 'user')
-            content = msg.get('content', '')
-            conversation_text += f"{role.upper()}: {content}\n"
-        
-        prompt = f"""You are an expert Scrum Master conducting a discovery interview to gather PROJECT REQUIREMENTS ONLY.
-
-                        IMPORTANT: Do NOT ask about the team members, their skills, or team composition. 
-                        Team information will be provided separately through resume uploads.
-                        Focus ONLY on the PROJECT itself.
-
-                        EXISTING CONTEXT:
-                        {existing_context}
-
-                        CONVERSATION SO FAR:
-                        {conversation_text}
-
-                        Your task:
-                        1. Analyze what PROJECT information is still missing (deadlines, tech stack, project priorities, scope, constraints, etc.)
-                        2. Generate ONE specific, focused question about the PROJECT to fill the most critical gap
-                        3. Assess context completeness (0-100%): How much do we know about:
-                        - Project deadlines and timeline
-                        - Technical requirements and technology stack
-                        - Project priorities and scope
-                        - Resource limitations and constraints
-                        - Business requirements and objectives
-
-                        DO NOT ask about:
-                        - Team members or their skills
-                        - Team composition or availability
-                        - Individual capabilities
-
-                        Respond in this EXACT format:
-                        QUESTION: [your question here]
-                        SUFFICIENCY_SCORE: [0-100]
-                        READY_TO_PLAN: [true/false] (true if score >= 80)
-
-                        If READY_TO_PLAN is true, the question can be "All context gathered. Ready to generate sprint plan."
-                    """
+        # Older turns collapse into a cached rolling summary; only the last
+        # few stay verbatim, keeping the prompt bounded over long interviews
+        summary = ""
+        if len(chat_history) > _VERBATIM_TURNS:
+            summary = self._summarize_older_turns(chat_history[:-_VERBATIM_TURNS])
+            recent = chat_history[-_VERBATIM_TURNS:]
+        else:
+            recent = chat_history
+
+        # Build conversation context in one join instead of repeated +=
+        conversation_text = "".join(
+            f"{_UP.get(msg.get('role', 'user')) or msg.get('role', 'user').upper()}: "
+            f"{msg.get('content', '')}\n"
+            for msg in recent
+        )
+        if summary:
+            conversation_text = (
+                f"SUMMARY OF EARLIER CONVERSATION:\n{summary}\n\n"
+                f"RECENT TURNS:\n{conversation_text}"
+            )
+
+        # Semantic cache lookup: embed only the latest user turn (the
+        # embedder truncates long text, so embedding the full context would
+        # make every turn look identical) and gate hits on an exact hash of
+        # the context so answers never leak across project states
+        cache_text = None
+        if self.semantic_cache is not None:
+            last_user_msg = ""
+            for msg in reversed(chat_history):
+                if msg.get('role') == 'user':
+                    last_user_msg = msg.get('content', '')
+                    break
+            cache_text = last_user_msg.strip()
+            try:
+                cached = self.semantic_cache.get(cache_text, context=existing_context)
+                if cached is not None:
+                    return cached
+            except Exception:
+                pass  # Cache problems must never break the interview
+
+
+        # Dynamic turn state goes after the static preamble, never inside it
+        dynamic_suffix = (
+            f"EXISTING CONTEXT:\n{existing_context}\n\n"
+            f"CONVERSATION SO FAR:\n{conversation_text}"
+        )
+
+        if SystemMessage is not None:
+            # System/human split keys provider prefix caching on the system block
+            prompt = [
+                SystemMessage(content=_STATIC_PROMPT_PREFIX),
+                HumanMessage(content=dynamic_suffix)
+            ]
+        else:
+            prompt = f"{_STATIC_PROMPT_PREFIX}\n{dynamic_suffix}"
         
         try:
-            response = self.llm.invoke(prompt)
-            response_text = response.content if hasattr(response, 'content') else str(response)
-            
-            # Parse response
+            # Stream the completion and stop consuming as soon as all three
+            # response fields have arrived; the tail tokens are never needed
+            response_text = ""
+            if hasattr(self.llm, 'stream'):
+                try:
+                    for chunk in self.llm.stream(prompt):
+                        piece = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                        response_text += piece
+                        if _RESP_RE.search(response_text):
+                            break
+                except Exception:
+                    response_text = ""  # fall through to the blocking call
+
+            if not response_text:
+                response = self.llm.invoke(prompt)
+                response_text = response.content if hasattr(response, 'content') else str(response)
+
+
+            # Parse response with one compiled-regex pass
             question = ""
             sufficiency_score = 0
             ready_to_plan = False
-            
-            for line in response_text.split('\n'):
-                if line.startswith('QUESTION:'):
-                    question = line.replace('QUESTION:', '').strip()
-                elif line.startswith('SUFFICIENCY_SCORE:'):
-                    try:
-                        sufficiency_score = int(line.replace('SUFFICIENCY_SCORE:', '').strip())
-                    except:
-                        sufficiency_score = 0
-                elif line.startswith('READY_TO_PLAN:'):
-                    ready_str = line.replace('READY_TO_PLAN:', '').strip().lower()
-                    ready_to_plan = ready_str == 'true' or sufficiency_score >= 80
-            
+
+            m = _RESP_RE.search(response_text)
+            if m:
+                question = m.group(1).strip()
+                sufficiency_score = int(m.group(2))
+                ready_to_plan = m.group(3).lower() == 'true' or sufficiency_score >= 80
+
             if not question:
                 question = "Could you tell me more about the project timeline and deadlines?"
             
-            return {
+            response = {
                 "question": question,
                 "sufficiency_score": min(100, max(0, sufficiency_score)),
                 "ready_to_plan": ready_to_plan
             }
+
+            if self.semantic_cache is not None and cache_text is not None:
+                try:
+                    self.semantic_cache.set(cache_text, response,
+                                            context=existing_context)
+                except Exception:
+                    pass
+
+            return response
         except Exception as e:
-            # Fallback question
+            # Fallback question; the error flag tells caching layers not to
+            # store this — a transient LLM failure must not be served for 24h
             return {
                 "question": "What are the key deadlines and priorities for this sprint?",
                 "sufficiency_score": 30,
-                "ready_to_plan": False
+                "ready_to_plan": False,
+                "error": True
             }
\ No newline at end of file
@@ -24,6 +24,22 @@ try:
 except ImportError:
     ChatOpenAI = None
 
+# Env vars each provider expects from LiteLLM. Gemini gets both spellings;
+# which one is read depends on the LiteLLM backend/version.
+# VertexAI is credential-file based; an API key is not enough.
+_PROVIDER_KEY_ENV = {
+    "openai": ("OPENAI_API_KEY",),
+    "anthropic": ("ANTHROPIC_API_KEY",),
+    "gemini": ("GEMINI_API_KEY", "GOOGLE_API_KEY"),
+    "google": ("GEMINI_API_KEY", "GOOGLE_API_KEY"),
+}
+
+
+def _setenv(key: str, value: str) -> None:
+    """Write os.environ only on change; setitem is a putenv syscall."""
+    if os.environ.get(key) != value:
+        os.environ[key] = value
+
 
 class ModelConfig:
     """Manages LLM configuration dynamically from Streamlit session state."""
@@ -33,15 +49,19 @@ class ModelConfig:
         self.model_name = "llama3"
         self.api_key = None
         self.base_url = "http://localhost:11434"
-        self._llm_instance = None
-    
+        # LLM instances keyed by (model_name, api_key, base_url), so config
+        # round-trips through the UI don't trigger provider re-initialization
+        self._llm_cache = {}
+
     def update_from_session_state(self, session_state):
         """Update configuration from Streamlit session state."""
         self.model_name = session_state.get("model_name", "llama3")
         self.api_key = session_state.get("api_key", None)
         self.base_url = session_state.get("base_url", "http://localhost:11434")
-        # Reset LLM instance when config changes
-        self._llm_instance = None
+
+    def _config_key(self):
+        """Cache key for the current provider configuration."""
+        return (self.model_name, self.api_key, self.base_url)
 
     @staticmethod
     def _normalize_model_id(model_name: str, base_url: Optional[str]) -> str:
@@ -88,27 +108,22 @@ class ModelConfig:
             return
 
         p = (provider or "").lower().strip()
-        if p in {"openai"}:
-            os.environ["OPENAI_API_KEY"] = api_key
-            if api_base:
-                os.environ["OPENAI_API_BASE"] = api_base
-        elif p in {"anthropic"}:
-            os.environ["ANTHROPIC_API_KEY"] = api_key
-        elif p in {"gemini", "google"}:
-            # LiteLLM typically accepts either of these depending on backend/version.
-            os.environ["GEMINI_API_KEY"] = api_key
-            os.environ["GOOGLE_API_KEY"] = api_key
-        # VertexAI is credential-file based; API key is not enough.
+        for env_key in _PROVIDER_KEY_ENV.get(p, ()):
+            _setenv(env_key, api_key)
+        if p == "openai" and api_base:
+            _setenv("OPENAI_API_BASE", api_base)
     
     def get_llm(self):
         """
         Returns a LangChain LLM object compatible with CrewAI.
         Uses LiteLLM to abstract model calls.
         """
-        # Return cached instance if config hasn't changed
-        if self._llm_instance is not None:
-            return self._llm_instance
-        
+        # Return cached instance for this exact configuration
+        cache_key = self._config_key()
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             base_url = (self.base_url or "").strip() or None
             model_id = self._normalize_model_id(self.model_name, base_url)
@@ -124,7 +139,7 @@ class ModelConfig:
             # Create LangChain ChatLiteLLM wrapper
             # This is compatible with CrewAI
             if ChatLiteLLM:
-                self._llm_instance = ChatLiteLLM(
+                llm = ChatLiteLLM(
                     model=model_id,
                     api_key=self.api_key if self.api_key else None,
                     # Only pass api_base for ollama/local usage
@@ -134,29 +149,31 @@ class ModelConfig:
             else:
                 # Fallback: use litellm directly via OpenAI-compatible interface
                 if ChatOpenAI and model_id.startswith("openai/"):
-                    self._llm_instance = ChatOpenAI(
+                    llm = ChatOpenAI(
                         model_name=self.model_name,
                         openai_api_key=self.api_key,
                         temperature=0.7
                     )
                 else:
                     raise Exception("ChatLiteLLM not available. Please install langchain-community.")
-            
-            return self._llm_instance
-            
+
+            self._llm_cache[cache_key] = llm
+            return llm
+
         except Exception as e:
             # Fallback: try using OpenAI-compatible interface
             if ChatOpenAI and (self.model_name or "").startswith("gpt-"):
                 try:
-                    self._llm_instance = ChatOpenAI(
+                    llm = ChatOpenAI(
                         model_name=self.model_name,
                         openai_api_key=self.api_key,
                         temperature=0.7
                     )
-                    return self._llm_instance
+                    self._llm_cache[cache_key] = llm
+                    return llm
                 except:
                     pass
-            
+
             raise Exception(f"Failed to initialize LLM: {str(e)}. Please check your model configuration.")
     
     def test_connection(self):
@@ -5,7 +5,75 @@ Manages three collections: resumes, backlog, project_context.
 import chromadb
 from chromadb.config import Settings
 from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+import io
 import os
+import threading
+import uuid
+
+import numpy as np
+
+# One PersistentClient per persist directory, shared across DBHandler
+# instances; opening a client reloads SQLite files and HNSW indices
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Shared embedding model, loaded lazily on first ingestion. Both document and
+# query embeddings go through this one model, so the space stays consistent —
+# but the model must not change for the lifetime of a persist directory, or
+# new vectors land in a different space than the stored ones.
+_EMBED = None
+
+# Default matches Chroma's built-in embedder; deployments can point this at a
+# smaller model (e.g. BAAI/bge-small-en-v1.5) to cut ingestion CPU
+_EMBED_MODEL = os.environ.get("COGSCRUM_EMBED_MODEL", "all-MiniLM-L6-v2")
+
+
+def _get_embedder():
+    """Lazy-load the shared SentenceTransformer, or None if unavailable."""
+    global _EMBED
+    if _EMBED is None:
+        try:
+            from sentence_transformers import SentenceTransformer
+            try:
+                # Prefer the ONNX backend: quantized CPU kernels, same vectors
+                _EMBED = SentenceTransformer(_EMBED_MODEL, backend="onnx")
+            except Exception:
+                _EMBED = SentenceTransformer(_EMBED_MODEL)
+        except Exception:
+            _EMBED = False  # remember the failure; fall back to Chroma's embedder
+    return _EMBED or None
+
+
+def _chunk_boundaries(cum, chunk_size):
+    """
+    Greedy chunk boundaries over cumulative word lengths.
+
+    Returns the split indices [0, b1, ..., n]; kept free of Python objects
+    so numba can JIT it when available (see below).
+    """
+    n = cum.shape[0]
+    out = np.empty(n + 1, dtype=np.int64)
+    out[0] = 0
+    count = 1
+    start = 0
+    base = 0
+    while start < n:
+        stop = np.searchsorted(cum, base + chunk_size, side='right')
+        if stop <= start:
+            stop = start + 1  # single word longer than chunk_size
+        out[count] = stop
+        count += 1
+        base = cum[stop - 1]
+        start = stop
+    return out[:count]
+
+
+try:
+    from numba import njit
+    _chunk_boundaries = njit(cache=True)(_chunk_boundaries)
+except ImportError:
+    pass  # pure-NumPy version is already fast enough for single uploads
 
 
 class DBHandler:
@@ -21,27 +89,36 @@ class DBHandler:
         self.persist_directory = persist_directory
         os.makedirs(persist_directory, exist_ok=True)
         
-        # Initialize persistent client
-        self.client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        # Initialize persistent client (one per directory, process-wide)
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.get(persist_directory)
+            if client is None:
+                client = chromadb.PersistentClient(
+                    path=persist_directory,
+                    settings=Settings(anonymized_telemetry=False)
+                )
+                _CLIENTS[persist_directory] = client
+        self.client = client
         
         # Initialize collections
         self.resumes_collection = self.client.get_or_create_collection(
             name="resumes",
-            metadata={"description": "Stored resume data"}
+            metadata={"description": "Stored resume data", "hnsw:space": "cosine"}
         )
         
         self.backlog_collection = self.client.get_or_create_collection(
             name="backlog",
-            metadata={"description": "Stored backlog items"}
+            metadata={"description": "Stored backlog items", "hnsw:space": "cosine"}
         )
         
         self.project_context_collection = self.client.get_or_create_collection(
             name="project_context",
-            metadata={"description": "Stored conversational context from interviews"}
+            metadata={"description": "Stored conversational context from interviews", "hnsw:space": "cosine"}
         )
+        
+        # Version counter bumped on every mutation; used to invalidate caches
+        self._version = 0
+        self._context_cache = {}
     
     def add_resume(self, text: str, metadata: Dict, candidate_id: Optional[str] = None):
         """
@@ -53,7 +130,7 @@ class DBHandler:
             candidate_id: Optional unique ID for the candidate
         """
         if candidate_id is None:
-            candidate_id = f"candidate_{len(self.resumes_collection.get()['ids'])}"
+            candidate_id = f"candidate_{uuid.uuid4().hex}"
         
         # Split text into chunks for better retrieval
         chunks = self._chunk_text(text, chunk_size=500)
@@ -64,11 +141,49 @@ class DBHandler:
         self.resumes_collection.add(
             documents=chunks,
             ids=ids,
-            metadatas=metadatas
+            metadatas=metadatas,
+            embeddings=self._embed_documents(chunks)
         )
-        
+
+        self._bump_version()
         return candidate_id
     
+    def add_resumes_bulk(self, texts: List[str], metadatas: List[Dict]) -> List[str]:
+        """
+        Add multiple resumes in a single batched collection write.
+
+        Args:
+            texts: Resume text contents
+            metadatas: Metadata dicts, one per resume
+
+        Returns:
+            List of generated candidate IDs
+        """
+        all_chunks = []
+        all_ids = []
+        all_metadatas = []
+        candidate_ids = []
+
+        for text, metadata in zip(texts, metadatas):
+            candidate_id = f"candidate_{uuid.uuid4().hex}"
+            candidate_ids.append(candidate_id)
+
+            chunks = self._chunk_text(text, chunk_size=500)
+            all_chunks.extend(chunks)
+            all_ids.extend(f"{candidate_id}_chunk_{i}" for i in range(len(chunks)))
+            all_metadatas.extend({**metadata, "chunk_index": i} for i in range(len(chunks)))
+
+        if all_chunks:
+            self.resumes_collection.add(
+                documents=all_chunks,
+                ids=all_ids,
+                metadatas=all_metadatas,
+                embeddings=self._embed_documents(all_chunks)
+            )
+            self._bump_version()
+
+        return candidate_ids
+
     def add_backlog_item(self, text: str, metadata: Dict, item_id: Optional[str] = None):
         """
         Add backlog item to the backlog collection.
@@ -79,16 +194,49 @@ class DBHandler:
             item_id: Optional unique ID for the item
         """
         if item_id is None:
-            item_id = f"backlog_{len(self.backlog_collection.get()['ids'])}"
+            item_id = f"backlog_{uuid.uuid4().hex}"
         
         self.backlog_collection.add(
             documents=[text],
             ids=[item_id],
             metadatas=[metadata]
         )
-        
+
+        self._bump_version()
         return item_id
     
+    def add_backlog_items_bulk(self, descriptions: List[str], metadatas: List[Dict],
+                               item_ids: Optional[List[Optional[str]]] = None) -> List[str]:
+        """
+        Add multiple backlog items in a single batched collection write.
+
+        Args:
+            descriptions: Backlog item descriptions
+            metadatas: Metadata dicts, one per item
+            item_ids: Optional IDs per item; missing entries are generated
+
+        Returns:
+            List of item IDs used
+        """
+        if item_ids is None:
+            item_ids = [None] * len(descriptions)
+
+        resolved_ids = []
+        for item_id in item_ids:
+            if not item_id:
+                item_id = f"backlog_{uuid.uuid4().hex}"
+            resolved_ids.append(item_id)
+
+        if descriptions:
+            self.backlog_collection.add(
+                documents=descriptions,
+                ids=resolved_ids,
+                metadatas=metadatas
+            )
+            self._bump_version()
+
+        return resolved_ids
+
     def add_context(self, text: str, metadata: Optional[Dict] = None):
         """
         Add conversational context from the interview.
@@ -100,14 +248,15 @@ class DBHandler:
         if metadata is None:
             metadata = {}
         
-        context_id = f"context_{len(self.project_context_collection.get()['ids'])}"
+        context_id = f"context_{uuid.uuid4().hex}"
         
         self.project_context_collection.add(
             documents=[text],
             ids=[context_id],
             metadatas={**metadata, "type": "interview_response"}
         )
-        
+
+        self._bump_version()
         return context_id
     
     def get_combined_context(self, query: str = "", n_results: int = 10) -> str:
@@ -122,66 +271,102 @@ class DBHandler:
         Returns:
             Combined context string
         """
-        context_parts = []
-        
-        # Get relevant resumes
-        if query:
-            resume_results = self.resumes_collection.query(
-                query_texts=[query],
-                n_results=n_results
-            )
-            if resume_results['documents']:
-                context_parts.append("=== RESUME DATA ===")
-                for doc, metadata in zip(resume_results['documents'][0], resume_results['metadatas'][0]):
-                    name = metadata.get('name', 'Unknown')
-                    context_parts.append(f"\nCandidate: {name}\n{doc}\n")
-        else:
-            # Get all resumes if no query
-            all_resumes = self.resumes_collection.get()
-            if all_resumes['documents']:
-                context_parts.append("=== RESUME DATA ===")
-                for doc, metadata in zip(all_resumes['documents'], all_resumes['metadatas']):
-                    name = metadata.get('name', 'Unknown')
-                    context_parts.append(f"\nCandidate: {name}\n{doc}\n")
-        
-        # Get relevant backlog items
-        if query:
-            backlog_results = self.backlog_collection.query(
-                query_texts=[query],
-                n_results=n_results
-            )
-            if backlog_results['documents']:
-                context_parts.append("\n=== BACKLOG ITEMS ===")
-                for doc, metadata in zip(backlog_results['documents'][0], backlog_results['metadatas'][0]):
-                    ticket_id = metadata.get('ticket_id', 'Unknown')
-                    context_parts.append(f"\nTicket: {ticket_id}\n{doc}\n")
-        else:
-            all_backlog = self.backlog_collection.get()
-            if all_backlog['documents']:
-                context_parts.append("\n=== BACKLOG ITEMS ===")
-                for doc, metadata in zip(all_backlog['documents'], all_backlog['metadatas']):
-                    ticket_id = metadata.get('ticket_id', 'Unknown')
-                    context_parts.append(f"\nTicket: {ticket_id}\n{doc}\n")
-        
-        # Get project context (interview responses)
+        # Reuse the cached string when nothing has mutated since last call
+        cache_key = (query, n_results)
+        cached = self._context_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Embed the query once and reuse it for all three collections;
+        # cosine on normalized vectors matches the sentence-transformer space
+        q_emb = None
         if query:
-            context_results = self.project_context_collection.query(
-                query_texts=[query],
-                n_results=n_results
+            embedder = _get_embedder()
+            if embedder is not None:
+                q_emb = embedder.encode([query], normalize_embeddings=True)[0].tolist()
+
+        def _fetch(collection):
+            if query:
+                if q_emb is not None:
+                    return collection.query(query_embeddings=[q_emb], n_results=n_results)
+                return collection.query(query_texts=[query], n_results=n_results)
+            # No query: bound the scan instead of materializing everything,
+            # which also keeps the assembled prompt from growing without limit
+            return collection.get(
+                limit=n_results * 5,
+                include=["documents", "metadatas"]
             )
-            if context_results['documents']:
-                context_parts.append("\n=== PROJECT CONTEXT (INTERVIEW) ===")
-                for doc in context_results['documents'][0]:
-                    context_parts.append(f"\n{doc}\n")
-        else:
-            all_context = self.project_context_collection.get()
-            if all_context['documents']:
-                context_parts.append("\n=== PROJECT CONTEXT (INTERVIEW) ===")
-                for doc in all_context['documents']:
-                    context_parts.append(f"\n{doc}\n")
-        
-        return "\n".join(context_parts)
+
+        # The three collection reads are independent; issue them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            resume_future = executor.submit(_fetch, self.resumes_collection)
+            backlog_future = executor.submit(_fetch, self.backlog_collection)
+            context_future = executor.submit(_fetch, self.project_context_collection)
+
+            resume_results = resume_future.result()
+            backlog_results = backlog_future.result()
+            context_results = context_future.result()
+
+        def _rows(results):
+            # query() nests results per query text; get() returns flat lists
+            if query:
+                return results['documents'][0], results['metadatas'][0]
+            return results['documents'], results['metadatas']
+
+        # Write sections straight into one buffer instead of collecting
+        # per-row f-strings and joining them at the end
+        buf = io.StringIO()
+        w = buf.write
+
+        # Relevant resumes
+        if resume_results['documents']:
+            w("=== RESUME DATA ===")
+            for doc, metadata in zip(*_rows(resume_results)):
+                w("\n\nCandidate: ")
+                w(metadata.get('name', 'Unknown'))
+                w("\n")
+                w(doc)
+                w("\n")
+
+        # Relevant backlog items
+        if backlog_results['documents']:
+            w("\n\n=== BACKLOG ITEMS ===")
+            for doc, metadata in zip(*_rows(backlog_results)):
+                w("\n\nTicket: ")
+                w(metadata.get('ticket_id', 'Unknown'))
+                w("\n")
+                w(doc)
+                w("\n")
+
+        # Project context (interview responses)
+        if context_results['documents']:
+            w("\n\n=== PROJECT CONTEXT (INTERVIEW) ===")
+            for doc, _ in zip(*_rows(context_results)):
+                w("\n\n")
+                w(doc)
+                w("\n")
+
+        combined = buf.getvalue()
+        self._context_cache[cache_key] = combined
+        return combined
     
+    def count_resumes(self) -> int:
+        """Number of stored resume chunks, without fetching documents."""
+        return self.resumes_collection.count()
+
+    def count_backlog(self) -> int:
+        """Number of stored backlog items, without fetching documents."""
+        return self.backlog_collection.count()
+
+    def get_version(self) -> int:
+        """Current mutation counter; changes whenever any collection is written."""
+        return self._version
+
+    def _bump_version(self):
+        """Record a mutation and invalidate cached context."""
+        self._version += 1
+        self._context_cache.clear()
+
     def get_all_resumes(self) -> List[Dict]:
         """Get all resumes with metadata."""
         results = self.resumes_collection.get()
@@ -213,28 +398,47 @@ class DBHandler:
         self.client.delete_collection("project_context")
         
         # Recreate collections
-        self.resumes_collection = self.client.get_or_create_collection(name="resumes")
-        self.backlog_collection = self.client.get_or_create_collection(name="backlog")
-        self.project_context_collection = self.client.get_or_create_collection(name="project_context")
+        self.resumes_collection = self.client.get_or_create_collection(
+            name="resumes", metadata={"hnsw:space": "cosine"})
+        self.backlog_collection = self.client.get_or_create_collection(
+            name="backlog", metadata={"hnsw:space": "cosine"})
+        self.project_context_collection = self.client.get_or_create_collection(
+            name="project_context", metadata={"hnsw:space": "cosine"})
+
+        self._bump_version()
     
+    def _embed_documents(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed documents in one batched forward pass.
+
+        Returns None when the shared embedder is unavailable, in which case
+        Chroma falls back to embedding each document with its own function.
+        """
+        embedder = _get_embedder()
+        if embedder is None:
+            return None
+
+        embeddings = embedder.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return embeddings.tolist()
+
     def _chunk_text(self, text: str, chunk_size: int = 500) -> List[str]:
         """Split text into chunks for better vector storage."""
         words = text.split()
-        chunks = []
-        current_chunk = []
-        current_length = 0
-        
-        for word in words:
-            word_length = len(word) + 1  # +1 for space
-            if current_length + word_length > chunk_size and current_chunk:
-                chunks.append(" ".join(current_chunk))
-                current_chunk = [word]
-                current_length = word_length
-            else:
-                current_chunk.append(word)
-                current_length += word_length
-        
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
-        
-        return chunks if chunks else [text]
+        if not words:
+            return [text]
+
+        # Prefix-sum the word lengths (+1 for the joining space) so each
+        # chunk boundary is a single searchsorted instead of a per-word loop
+        lens = np.fromiter((len(w) + 1 for w in words), dtype=np.int64, count=len(words))
+        cum = np.cumsum(lens)
+
+        bounds = _chunk_boundaries(cum, chunk_size)
+        return [
+            " ".join(words[int(a):int(b)])
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
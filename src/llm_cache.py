@@ -0,0 +1,119 @@
+"""
+Hash-keyed LLM response cache.
+Stores deterministic generate_question results on disk so repeated prompts
+(identical chat history + context) skip the LLM round-trip entirely.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+
+class LLMCache:
+    """Disk-backed cache for LLM responses, keyed by a sha256 of the inputs."""
+
+    def __init__(self, cache_directory: str = "./llm_cache", ttl_seconds: int = 86400):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_directory: Directory to store cached responses as JSON files
+            ttl_seconds: Time-to-live for cached entries (default 24 hours)
+        """
+        self.cache_directory = cache_directory
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "misses": 0}
+        os.makedirs(cache_directory, exist_ok=True)
+
+    @staticmethod
+    def cache_key(model: str, messages: List[Dict], context: str = "") -> str:
+        """
+        Compute a deterministic cache key from model, messages, and context.
+
+        Args:
+            model: Model name/identifier
+            messages: List of chat message dicts
+            context: Additional context string included in the prompt
+
+        Returns:
+            Hex sha256 digest usable as a filename
+        """
+        payload = json.dumps(
+            {"model": model, "messages": messages, "context": context},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from cache_key()
+
+        Returns:
+            Cached response dict, or None on miss/expiry
+        """
+        path = os.path.join(self.cache_directory, f"{key}.json")
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            if time.time() - entry.get("timestamp", 0) > self.ttl_seconds:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            return entry["response"]
+        except (OSError, ValueError, KeyError):
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key: str, response: Dict):
+        """
+        Store a response in the cache.
+
+        Args:
+            key: Cache key from cache_key()
+            response: JSON-serializable response dict
+        """
+        path = os.path.join(self.cache_directory, f"{key}.json")
+        try:
+            with open(path, "w") as f:
+                json.dump({"timestamp": time.time(), "response": response}, f)
+        except OSError:
+            # Cache writes are best-effort; never fail the caller
+            pass
+
+
+def cached_generate_question(interviewer, llm_cache: LLMCache):
+    """
+    Wrap an interviewer's generate_question with the hash-keyed cache.
+
+    Args:
+        interviewer: InterviewerAgent instance
+        llm_cache: LLMCache instance to consult
+
+    Returns:
+        A function with the same signature as generate_question
+    """
+    inner = interviewer.generate_question
+
+    def generate_question(chat_history, existing_context=""):
+        key = llm_cache.cache_key(
+            interviewer.model_config.model_name,
+            chat_history,
+            existing_context
+        )
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = inner(chat_history, existing_context)
+        # Never cache the fallback produced when the LLM call failed; a
+        # transient error (bad key, outage) would otherwise be replayed
+        # for the cache's full TTL
+        if not result.get("error"):
+            llm_cache.set(key, result)
+        return result
+
+    return generate_question
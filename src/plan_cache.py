@@ -0,0 +1,140 @@
+"""
+Agentic plan cache backed by ChromaDB.
+Stores finished sprint plans keyed by an embedding of the planning context so
+repeat (or near-duplicate) planning requests can replay or adapt a prior plan
+instead of re-running the full three-agent crew.
+"""
+import hashlib
+import json
+import time
+from typing import Dict, Optional, Tuple
+
+
+class CachedPlanTask:
+    """Stand-in for a CrewAI task whose output was replayed from cache."""
+
+    def __init__(self, output: str):
+        self.output = output
+
+
+class CachedPlanCrew:
+    """Stand-in crew that returns a cached plan without any LLM calls."""
+
+    from_cache = True
+
+    def __init__(self, payload: Dict):
+        self._payload = payload
+        self.tasks = []
+
+    def kickoff(self):
+        return self._payload.get("critic_output", "")
+
+
+class PlanCache:
+    """Embedding-keyed cache of complete sprint-plan outputs."""
+
+    def __init__(self, client, collection_name: str = "plans",
+                 adapt_threshold: float = 0.25, ttl_seconds: int = 86400):
+        """
+        Initialize the cache on an existing Chroma client.
+
+        Verbatim replay is reserved for byte-identical contexts (the exact
+        hash tier); embedding distance alone is not trusted for it because
+        the default embedder truncates long contexts, making a context with
+        e.g. an appended correction embed the same as the original.
+
+        Args:
+            client: ChromaDB client (shared with DBHandler)
+            collection_name: Name of the plans collection
+            adapt_threshold: Max distance for offering a plan as an
+                adaptation template to the scheduler
+            ttl_seconds: Time-to-live for cached plans (default 24 hours)
+        """
+        self.collection = client.get_or_create_collection(
+            name=collection_name,
+            # Cosine space to match the reuse/adapt thresholds; Chroma's
+            # default squared L2 roughly doubles the distances they assume
+            metadata={"description": "Cached sprint plans for reuse/adaptation",
+                      "hnsw:space": "cosine"}
+        )
+        self.adapt_threshold = adapt_threshold
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _context_hash(combined_context: str) -> str:
+        """Stable exact-match key for a planning context."""
+        return hashlib.sha256(combined_context.strip().encode("utf-8")).hexdigest()
+
+    def lookup(self, combined_context: str) -> Optional[Tuple[Dict, float, bool]]:
+        """
+        Find the nearest cached plan for a planning context.
+
+        Args:
+            combined_context: Combined context string fed to the crew
+
+        Returns:
+            Tuple of (payload dict, distance, exact) when an unexpired plan
+            is within adapt_threshold, otherwise None. ``exact`` is True only
+            for a hash match on a byte-identical context; only those hits are
+            safe to replay verbatim
+        """
+        if self.collection.count() == 0:
+            return None
+
+        # Exact-match fast path: an unchanged context (Streamlit rerun,
+        # retry) resolves on the hash alone, skipping the embedding query
+        exact = self.collection.get(
+            where={"context_hash": self._context_hash(combined_context)},
+            limit=1,
+            include=["metadatas"]
+        )
+        if exact["ids"]:
+            metadata = exact["metadatas"][0]
+            if time.time() - metadata.get("ts", 0) <= self.ttl_seconds:
+                try:
+                    return json.loads(metadata["payload"]), 0.0, True
+                except (KeyError, ValueError):
+                    pass
+
+        results = self.collection.query(
+            query_texts=[combined_context.strip()],
+            n_results=1
+        )
+        if not results['ids'] or not results['ids'][0]:
+            return None
+
+        distance = results['distances'][0][0]
+        if distance > self.adapt_threshold:
+            return None
+
+        metadata = results['metadatas'][0][0]
+        if time.time() - metadata.get("ts", 0) > self.ttl_seconds:
+            return None
+
+        try:
+            return json.loads(metadata["payload"]), distance, False
+        except (KeyError, ValueError):
+            return None
+
+    def record(self, combined_context: str, scheduler_output: str, critic_output: str):
+        """
+        Store a finished plan for later reuse.
+
+        Args:
+            combined_context: Combined context the plan was generated from
+            scheduler_output: Scheduler task output (the assignment table)
+            critic_output: Critic task output (the validation report)
+        """
+        payload = json.dumps({
+            "scheduler_output": scheduler_output,
+            "critic_output": critic_output
+        })
+        self.collection.add(
+            documents=[combined_context.strip()],
+            ids=[f"plan_{int(time.time() * 1000)}_{self.collection.count()}"],
+            metadatas=[{
+                "payload": payload,
+                "ts": time.time(),
+                "context_hash": self._context_hash(combined_context)
+            }]
+        )
@@ -0,0 +1,100 @@
+"""
+Semantic LLM response cache backed by ChromaDB.
+Returns a previously generated interview response when a new prompt is
+semantically close enough to a cached one, skipping the LLM round-trip.
+"""
+import hashlib
+import json
+import time
+from typing import Dict, Optional
+
+
+class SemanticCache:
+    """Embedding-keyed cache for interview question/score responses."""
+
+    def __init__(self, client, collection_name: str = "qa_cache",
+                 distance_threshold: float = 0.15, ttl_seconds: int = 86400):
+        """
+        Initialize the cache on an existing Chroma client.
+
+        Args:
+            client: ChromaDB client (shared with DBHandler)
+            collection_name: Name of the cache collection
+            distance_threshold: Max embedding distance counted as a hit
+            ttl_seconds: Time-to-live for cached entries (default 24 hours)
+        """
+        self.collection = client.get_or_create_collection(
+            name=collection_name,
+            # Cosine space to match distance_threshold; Chroma's default is
+            # squared L2, under which the 0.15 cutoff almost never fires
+            metadata={"description": "Semantic cache of interview responses",
+                      "hnsw:space": "cosine"}
+        )
+        self.distance_threshold = distance_threshold
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _context_hash(context: str) -> str:
+        """Stable exact-match key for the non-embedded context portion."""
+        return hashlib.sha256(context.strip().encode("utf-8")).hexdigest()
+
+    def get(self, text: str, context: str = "") -> Optional[Dict]:
+        """
+        Look up the nearest cached entry for the given text.
+
+        Only the short volatile text is embedded — Chroma's default embedder
+        truncates long inputs, so embedding a multi-KB context would collapse
+        every turn to near-identical vectors. The context is matched exactly
+        via a metadata hash instead, as PlanCache.lookup does.
+
+        Args:
+            text: Normalized volatile prompt text (the latest user turn)
+            context: Surrounding context that must match exactly for a hit
+
+        Returns:
+            Cached response dict, or None when there is no close enough,
+            unexpired entry
+        """
+        if self.collection.count() == 0:
+            return None
+
+        results = self.collection.query(
+            query_texts=[text],
+            n_results=1,
+            where={"context_hash": self._context_hash(context)}
+        )
+        if not results['ids'] or not results['ids'][0]:
+            return None
+
+        distance = results['distances'][0][0]
+        if distance > self.distance_threshold:
+            return None
+
+        metadata = results['metadatas'][0][0]
+        if time.time() - metadata.get("ts", 0) > self.ttl_seconds:
+            return None
+
+        try:
+            return json.loads(metadata["payload"])
+        except (KeyError, ValueError):
+            return None
+
+    def set(self, text: str, response: Dict, context: str = ""):
+        """
+        Store a response keyed by the prompt text's embedding.
+
+        Args:
+            text: Normalized volatile prompt text used for lookup
+            context: Surrounding context, stored as an exact-match hash
+            response: JSON-serializable response dict
+        """
+        entry_id = f"qa_{int(time.time() * 1000)}_{self.collection.count()}"
+        self.collection.add(
+            documents=[text],
+            ids=[entry_id],
+            metadatas=[{
+                "payload": json.dumps(response),
+                "ts": time.time(),
+                "context_hash": self._context_hash(context)
+            }]
+        )
@@ -1,36 +1,70 @@
+import functools
+
 from crewai import Task
 
+# Fixed instruction text for each task, byte-stable across invocations and
+# placed ahead of the variable payload so provider prompt caching can reuse
+# the prefill of the instruction prefix.
+_PARSE_RESUMES_INSTRUCTION = (
+    "Analyze the resume text provided below. "
+    "Extract a JSON object containing: Name, Years_Experience, "
+    "Skills_List, and Seniority_Level."
+)
+
+_PLAN_SPRINT_INSTRUCTION = (
+    "Using the employee profiles and sprint backlog provided below, assign "
+    "tasks to employees. "
+    "Match skills in the backlog tickets to skills in employee profiles. "
+    "Respect seniority: Juniors need 1.5x time for complex tasks."
+)
+
+_CRITIQUE_PLAN_INSTRUCTION = (
+    "Review the sprint plan provided below. "
+    "Identify any risks, unassigned high-priority tasks, or capacity overloads. "
+    "Provide a 'Reasoning Trace' for why the plan is or isn't viable."
+)
+
+
+# Formatted descriptions are memoized on their inputs: retries and reruns
+# with unchanged payloads reuse the assembled string. Task objects are NOT
+# cached — CrewAI writes each task's output back onto the instance.
+@functools.lru_cache(maxsize=128)
+def _parse_resumes_description(resume_text: str) -> str:
+    return f"{_PARSE_RESUMES_INSTRUCTION}\n\nRESUME TEXT:\n'{resume_text}'"
+
+
+@functools.lru_cache(maxsize=128)
+def _plan_sprint_description(employees: str, backlog: str) -> str:
+    return (
+        f"{_PLAN_SPRINT_INSTRUCTION}\n\n"
+        f"EMPLOYEE PROFILES:\n{employees}\n\n"
+        f"SPRINT BACKLOG:\n{backlog}"
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _critique_plan_description(sprint_plan: str) -> str:
+    return f"{_CRITIQUE_PLAN_INSTRUCTION}\n\nSPRINT PLAN:\n{sprint_plan}"
+
+
 class CognitiveScrumTasks:
     def parse_resumes_task(self, agent, resume_text):
         return Task(
-            description=(
-                f"Analyze the following resume text: '{resume_text}'. "
-                "Extract a JSON object containing: Name, Years_Experience, "
-                "Skills_List, and Seniority_Level."
-            ),
+            description=_parse_resumes_description(str(resume_text)),
             agent=agent,
             expected_output="A structured JSON object representing the candidate's profile."
         )
 
     def plan_sprint_task(self, agent, employees, backlog):
         return Task(
-            description=(
-                f"Using the following employee profiles: {employees} "
-                f"and this sprint backlog: {backlog}, assign tasks to employees. "
-                "Match skills in the backlog tickets to skills in employee profiles. "
-                "Respect seniority: Juniors need 1.5x time for complex tasks."
-            ),
+            description=_plan_sprint_description(str(employees), str(backlog)),
             agent=agent,
             expected_output="A Sprint Schedule Matrix mapping tasks to employees with time estimates."
         )
 
     def critique_plan_task(self, agent, sprint_plan):
         return Task(
-            description=(
-                f"Review this sprint plan: {sprint_plan}. "
-                "Identify any risks, unassigned high-priority tasks, or capacity overloads. "
-                "Provide a 'Reasoning Trace' for why the plan is or isn't viable."
-            ),
+            description=_critique_plan_description(str(sprint_plan)),
             agent=agent,
             expected_output="A text-based Risk Analysis and Final Approval status."
-        )
\ No newline at end of file
+        )
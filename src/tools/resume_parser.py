@@ -1,13 +1,35 @@
+import os
+import shutil
+import subprocess
+
 import PyPDF2
-from pydantic import BaseModel, Field
+import msgspec
+
 from typing import List
 
-# Define the structured output format (Data Normalization Layer)
-class EmployeeProfile(BaseModel):
+# Prefer PDFium over PyPDF2 when available; same engine preference as
+# src/utils.py so both parse_pdf copies produce comparable text
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# Same opt-in pdftotext fast path as src/utils.py; resolved once at import
+_PDFTOTEXT = shutil.which("pdftotext")
+
+# Define the structured output format (Data Normalization Layer).
+# msgspec.Struct validates in a single C call on decode, far cheaper per
+# profile than Pydantic's per-field validation when batching resumes.
+class EmployeeProfile(msgspec.Struct):
     name: str
     years_experience: int
-    skills: List[str] = Field(description="List of technical skills extracted")
-    seniority_level: str = Field(description="Junior, Mid, Senior, or Lead")
+    skills: List[str]  # technical skills extracted
+    seniority_level: str  # Junior, Mid, Senior, or Lead
+
+
+def decode_employee_profile(payload) -> EmployeeProfile:
+    """Decode and validate an LLM-produced JSON profile in one C call."""
+    return msgspec.json.decode(payload, type=EmployeeProfile)
 
 def parse_pdf(file_path):
     """
@@ -15,12 +37,37 @@ def parse_pdf(file_path):
     Mitigates: Unstructured Inputs challenge.
     """
     try:
+        if _PDFTOTEXT and os.environ.get("COGSCRUM_PDFTOTEXT") == "1":
+            try:
+                proc = subprocess.run(
+                    [_PDFTOTEXT, "-layout", "-nopgbrk", file_path, "-"],
+                    capture_output=True,
+                    check=True
+                )
+                return proc.stdout.decode("utf-8", "ignore")
+            except Exception:
+                pass  # fall through to the Python engines
+
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                pages_text = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    pages_text.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+                return "\n".join(pages_text)
+            finally:
+                pdf.close()
+
         with open(file_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            return text
+            # Join once instead of += per page; `or ""` guards image-only
+            # pages where extract_text returns None
+            return "\n".join(
+                page.extract_text() or "" for page in reader.pages
+            )
     except Exception as e:
         return f"Error reading PDF: {str(e)}"
 
@@ -1,10 +1,82 @@
 """
 Utility functions for PDF parsing and data processing.
 """
-import PyPDF2
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional
+import functools
 import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+
+# Prefer PDFium (Google's C++ engine, much faster per page and better text
+# quality than PyPDF2); keep PyPDF2 as the fallback engine. Imported lazily
+# like pandas/PyPDF2 below so callers that never touch PDFs or tables don't
+# pay the import on Streamlit cold start.
+_PDFIUM = None
+
+
+def _get_pdfium():
+    """Lazy optional import of pypdfium2; False remembers unavailability."""
+    global _PDFIUM
+    if _PDFIUM is None:
+        try:
+            import pypdfium2 as pdfium
+            _PDFIUM = pdfium
+        except ImportError:
+            _PDFIUM = False
+    return _PDFIUM or None
+
+# Rust-based JSON parser, 2-5x faster than stdlib and happy with raw bytes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Poppler's pdftotext CLI, resolved once at import. Opt-in fast path
+# (COGSCRUM_PDFTOTEXT=1): native C++ speed, but -layout spacing differs
+# slightly from the Python engines, so it stays behind a flag
+_PDFTOTEXT = shutil.which("pdftotext")
+
+# Expected backlog CSV schema, in output order
+_BACKLOG_COLS = ["ticket_id", "description", "complexity", "required_skills"]
+
+# CSVs above this size stream through read_csv in chunks
+_CSV_STREAM_BYTES = 10 * 1024 * 1024
+
+# Candidate-name heuristic: up to four capitalized words at the top of the
+# resume (handles initials, hyphens and apostrophes)
+_NAME_RE = re.compile(r"([A-Z][A-Za-z.'-]+(?:[ \t]+[A-Z][A-Za-z.'-]+){0,3})")
+
+# Deletes separator characters; a markdown separator cell translates to ""
+_SEP_TABLE = str.maketrans("", "", "-: ")
+
+# Table-header keywords for detecting the start of the plan table
+_HEADER_KEYWORDS = frozenset(
+    {'task_id', 'assignee', 'estimated_hours', 'risk_level', 'reasoning_trace'})
+
+# New-table-row detection inside reasoning continuations: task IDs like
+# "S1-T..." or "T-..."; compiled once instead of five substring scans per line
+_NEW_ROW_RE = re.compile(r'\b(?:s[1-5]-t|t-)', re.IGNORECASE)
+
+# Fallback pattern for "Task T-101: Assignee: John, Hours: 8, Risk: Low" style
+# output, compiled once at import instead of per parse call. Compiled with
+# RE2 (linear-time DFA) when google-re2 is installed: the pattern's optional
+# groups can backtrack quadratically under Python's re on adversarial plans.
+_PLAN_FALLBACK_PATTERN = (
+    r'(?:Task[_\s]*(?:ID)?[:\s]*)?([T\-]?\d+|[A-Z]+\-\d+)[:\s]+(?:Assignee[:\s]+)?'
+    r'([A-Za-z\s]+?)(?:[,\s]+Hours?[:\s]+)?(\d+)?(?:[,\s]+Risk[:\s]+)?([A-Za-z]+)?'
+)
+try:
+    import re2
+    _PLAN_FALLBACK_RE = re2.compile(
+        _PLAN_FALLBACK_PATTERN, re2.IGNORECASE | re2.MULTILINE)
+except Exception:
+    _PLAN_FALLBACK_RE = re.compile(
+        _PLAN_FALLBACK_PATTERN, re.IGNORECASE | re.MULTILINE)
 
 
 def parse_pdf(file) -> str:
@@ -16,23 +88,96 @@ def parse_pdf(file) -> str:
         
     Returns:
         Extracted text string
+
+    Raises:
+        OSError: If the file cannot be read
+        pypdfium2.PdfiumError / PyPDF2.errors.PdfReadError: On malformed PDFs
     """
+    # Parse errors propagate with their original type and traceback; the
+    # old catch-all rewrapped everything as a bare Exception, which hid the
+    # cause from callers that want to distinguish bad files from bad reads
+    # Read the whole file into memory once so the parser works against
+    # an in-memory buffer instead of issuing many small stream reads
+    if hasattr(file, 'read'):
+        file.seek(0)
+        data = file.read()
+    else:
+        # Assume it's a file path
+        with open(file, 'rb') as f:
+            data = f.read()
+
+    if _PDFTOTEXT and os.environ.get("COGSCRUM_PDFTOTEXT") == "1":
+        text = _pdftotext_bytes(data)
+        if text is not None:
+            return text.strip()
+
+    if _get_pdfium() is not None:
+        return _parse_pdf_pdfium(data).strip()
+
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    n_pages = len(reader.pages)
+
+    # PyPDF2 extraction is CPU-bound pure Python, so pages of a large
+    # PDF extract in worker processes; small PDFs stay serial since
+    # pool spawn costs more than the extraction itself
+    if n_pages >= 4:
+        try:
+            with ProcessPoolExecutor(max_workers=min(n_pages, os.cpu_count() or 1)) as executor:
+                pages_text = list(executor.map(
+                    _extract_page_bytes,
+                    [(data, i) for i in range(n_pages)]
+                ))
+            return "\n".join(pages_text).strip()
+        except Exception:
+            pass  # pool unavailable (e.g. restricted spawn); go serial
+
+    # Join once instead of += per page; `or ""` guards image-only
+    # pages where PyPDF2's extract_text returns None
+    return "\n".join(
+        page.extract_text() or "" for page in reader.pages
+    ).strip()
+
+
+def _extract_page_bytes(args) -> str:
+    """Worker: re-open the PDF from bytes and extract one page's text."""
+    import PyPDF2
+    data, index = args
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return reader.pages[index].extract_text() or ""
+
+
+def _pdftotext_bytes(data: bytes) -> Optional[str]:
+    """Run Poppler's pdftotext over in-memory PDF bytes; None on any failure."""
+    tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
     try:
-        # Handle Streamlit UploadedFile
-        if hasattr(file, 'read'):
-            file.seek(0)
-            reader = PyPDF2.PdfReader(file)
-        else:
-            # Assume it's a file path
-            reader = PyPDF2.PdfReader(file)
-        
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        
-        return text.strip()
-    except Exception as e:
-        raise Exception(f"Error parsing PDF: {str(e)}")
+        tmp.write(data)
+        tmp.close()
+        proc = subprocess.run(
+            [_PDFTOTEXT, "-layout", "-nopgbrk", tmp.name, "-"],
+            capture_output=True,
+            check=True
+        )
+        return proc.stdout.decode("utf-8", "ignore")
+    except Exception:
+        return None  # caller falls back to the Python engines
+    finally:
+        os.unlink(tmp.name)
+
+
+def _parse_pdf_pdfium(data: bytes) -> str:
+    """Extract text with PDFium, closing native handles as pages are read."""
+    pdf = _get_pdfium().PdfDocument(data)
+    try:
+        pages_text = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            pages_text.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return "\n".join(pages_text)
+    finally:
+        pdf.close()
 
 
 def parse_csv_backlog(file) -> List[Dict]:
@@ -46,28 +191,60 @@ def parse_csv_backlog(file) -> List[Dict]:
         
     Returns:
         List of backlog item dictionaries
+
+    Raises:
+        pandas.errors.ParserError / UnicodeDecodeError: On malformed CSVs
     """
+    import pandas as pd
+
+    # Malformed files raise pandas/codec errors directly instead of being
+    # rewrapped as a bare Exception
+    # Handle Streamlit UploadedFile
+    if hasattr(file, 'read'):
+        file.seek(0)
+
+    # Very large backlogs stream through the C parser in chunks, keeping
+    # peak memory at one chunk instead of the whole frame
+    if _peek_size(file) > _CSV_STREAM_BYTES:
+        records = []
+        for chunk in pd.read_csv(file, dtype=str, chunksize=100_000,
+                                 usecols=lambda c: c in _BACKLOG_COLS):
+            records.extend(_coerce_backlog_frame(chunk))
+        return records
+
+    # Arrow's SIMD CSV parser when pyarrow is installed; it doesn't take
+    # a usecols callable, but the reindex below drops extras anyway
     try:
-        # Handle Streamlit UploadedFile
-        if hasattr(file, 'read'):
+        df = pd.read_csv(file, engine="pyarrow", dtype=str)
+    except (ImportError, TypeError, ValueError):
+        if hasattr(file, 'seek'):
             file.seek(0)
-            df = pd.read_csv(file)
-        else:
-            df = pd.read_csv(file)
-        
-        backlog_items = []
-        for _, row in df.iterrows():
-            item = {
-                "ticket_id": str(row.get("ticket_id", "")),
-                "description": str(row.get("description", "")),
-                "complexity": str(row.get("complexity", "Medium")),
-                "required_skills": str(row.get("required_skills", ""))
-            }
-            backlog_items.append(item)
-        
-        return backlog_items
-    except Exception as e:
-        raise Exception(f"Error parsing CSV: {str(e)}")
+        # dtype=str skips type inference; the usecols callable drops extra
+        # columns at parse time without erroring when expected ones are absent
+        df = pd.read_csv(file, dtype=str, usecols=lambda c: c in _BACKLOG_COLS)
+
+    return _coerce_backlog_frame(df)
+
+
+def _coerce_backlog_frame(df) -> List[Dict]:
+    """Column-wise coercion of a raw backlog frame into record dicts."""
+    df = df.reindex(columns=_BACKLOG_COLS)
+    df["complexity"] = df["complexity"].fillna("Medium")
+    df = df.fillna("").astype(str)
+    return df.to_dict(orient="records")
+
+
+def _peek_size(file) -> int:
+    """Size of a path or seekable file-like object in bytes; 0 if unknown."""
+    try:
+        if hasattr(file, 'seek'):
+            file.seek(0, os.SEEK_END)
+            size = file.tell()
+            file.seek(0)
+            return size
+        return os.path.getsize(file)
+    except OSError:
+        return 0
 
 
 def parse_json_backlog(file) -> List[Dict]:
@@ -81,15 +258,16 @@ def parse_json_backlog(file) -> List[Dict]:
         List of backlog item dictionaries
     """
     try:
-        import json
-        
         # Handle Streamlit UploadedFile
         if hasattr(file, 'read'):
             file.seek(0)
-            data = json.load(file)
+            raw = file.read()
         else:
-            with open(file, 'r') as f:
-                data = json.load(f)
+            with open(file, 'rb') as f:
+                raw = f.read()
+
+        # Both parsers take bytes directly; no intermediate str decode
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         
         # Handle both list and dict formats
         if isinstance(data, list):
@@ -113,13 +291,19 @@ def extract_candidate_name(resume_text: str) -> str:
     Returns:
         Candidate name (or "Unknown")
     """
-    lines = resume_text.strip().split('\n')
-    if lines:
-        # First non-empty line is often the name
-        for line in lines[:5]:
-            line = line.strip()
-            if line and len(line.split()) <= 4:  # Name is usually short
-                return line
+    # Only the top of the document matters; slicing avoids splitting a
+    # multi-KB resume into lines just to inspect the first few
+    prefix = resume_text.lstrip()[:400]
+
+    m = _NAME_RE.match(prefix)
+    if m:
+        return m.group(1)
+
+    # Fall back to the first short line of the prefix
+    for line in prefix.split('\n')[:5]:
+        line = line.strip()
+        if line and len(line.split()) <= 4:  # Name is usually short
+            return line
     return "Unknown"
 
 
@@ -133,27 +317,57 @@ def parse_sprint_plan_output(plan_text: str) -> tuple:
     Returns:
         Tuple of (DataFrame with task assignments, full text response)
     """
-    import re
-    
-    # Try to extract table data from the text
-    task_assignments = []
-    
-    # Look for table-like structures with Task_ID, Assignee, etc.
-    # Pattern 1: Markdown table format
-    markdown_table_pattern = r'\|.*Task.*\|.*Assignee.*\|.*Hours.*\|.*Risk.*\|'
+    import pandas as pd
+
+    # The parse itself is pure in plan_text and memoized; Streamlit reruns
+    # re-display the same plan many times and only pay the frame rebuild
+    ids, assignees, hours, risks, traces = _parse_plan_columns(plan_text)
+
+    # Column-oriented construction; empty lists yield the empty frame with
+    # the expected columns, no separate branch needed
+    df = pd.DataFrame({
+        "Task_ID": list(ids),
+        "Assignee": list(assignees),
+        "Estimated_Hours": list(hours),
+        "Risk_Level": list(risks),
+        "Reasoning_Trace": list(traces)
+    })
+
+    # Arrow-backed strings render and serialize faster than object dtype;
+    # skipped when pyarrow isn't installed
+    try:
+        df = df.astype("string[pyarrow]")
+    except (ImportError, TypeError):
+        pass
+
+    return df, plan_text
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_plan_columns(plan_text: str) -> tuple:
+    """Cached parsing core; returns the five assignment columns as tuples."""
+    # Accumulate column-wise so the DataFrame builds from parallel lists in
+    # one pass instead of inferring over a list of per-row dicts
+    ids = []
+    assignees = []
+    hours = []
+    risks = []
+    traces = []
     
-    # Pattern 2: Structured text format with Task_ID, Assignee, etc.
+    # Structured text format with Task_ID, Assignee, etc.
     # Handle multi-line reasoning traces that continue after table rows
     lines = plan_text.split('\n')
     in_table_section = False
     table_row_indices = []  # Store (line_content, line_number) for table rows
     
     for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        line_stripped = line.strip()
+        # Strip once and lower the stripped text once; every check below
+        # works off these two cached forms
+        ls = line.strip()
+        ll = ls.lower()
         
         # Detect table start - look for header row
-        if any(keyword in line_lower for keyword in ['task_id', 'assignee', 'estimated_hours', 'risk_level', 'reasoning_trace']):
+        if any(keyword in ll for keyword in _HEADER_KEYWORDS):
             if '|' in line:
                 in_table_section = True
                 table_row_indices.append((line, i))
@@ -162,7 +376,7 @@ def parse_sprint_plan_output(plan_text: str) -> tuple:
         if in_table_section:
             if '|' in line and any(char.isalnum() for char in line):  # Table row with content
                 table_row_indices.append((line, i))
-            elif not line_stripped:
+            elif not ls:
                 # Empty line - continue
                 pass
             elif '|' not in line and i > 0:
@@ -171,14 +385,14 @@ def parse_sprint_plan_output(plan_text: str) -> tuple:
                     last_row_idx = table_row_indices[-1][1]
                     if i - last_row_idx <= 5:
                         # Might be reasoning continuation - check for keywords
-                        if any(keyword in line_stripped.lower() for keyword in ['assignment:', 'estimate:', 'risk:', '**']):
+                        if any(keyword in ll for keyword in ('assignment:', 'estimate:', 'risk:', '**')):
                             # This is reasoning continuation, attach to last row
                             last_line, last_idx = table_row_indices[-1]
-                            table_row_indices[-1] = (last_line + " " + line_stripped, last_idx)
+                            table_row_indices[-1] = (last_line + " " + ls, last_idx)
                         elif i - last_row_idx <= 2:
                             # Very close, likely continuation
                             last_line, last_idx = table_row_indices[-1]
-                            table_row_indices[-1] = (last_line + " " + line_stripped, last_idx)
+                            table_row_indices[-1] = (last_line + " " + ls, last_idx)
                     else:
                         # Too far, end table section
                         in_table_section = False
@@ -204,8 +418,9 @@ def parse_sprint_plan_output(plan_text: str) -> tuple:
                         parts = parts[:-1]
                     # Filter out separator rows (all dashes/colons)
                     if parts and len(parts) >= 3:
-                        # Check if it's a separator row
-                        is_separator = all(not p.strip() or all(c in '-: ' for c in p.strip()) for p in parts)
+                        # A separator cell deletes to nothing; one C-level
+                        # translate per cell instead of a per-char loop
+                        is_separator = all(not p.translate(_SEP_TABLE) for p in parts)
                         if not is_separator:
                             cleaned_lines.append(parts)
             
@@ -234,11 +449,34 @@ def parse_sprint_plan_output(plan_text: str) -> tuple:
                 
                 # Extract data rows - handle multi-line reasoning traces
                 lines_list = plan_text.split('\n')
-                row_idx = 0
-                
+
+                # Index each row's task ID to its table line in one pass over
+                # the plan, instead of rescanning every line for every row.
+                # The assignee prefix must co-occur on the line: a short task
+                # ID like "1" appears as a substring of many rows, so the ID
+                # alone would index the wrong line
+                row_keys = []
+                if task_col is not None:
+                    for row in cleaned_lines[1:]:
+                        if task_col < len(row) and row[task_col]:
+                            assignee = (
+                                row[assignee_col][:10]
+                                if assignee_col is not None and assignee_col < len(row)
+                                else ""
+                            )
+                            row_keys.append((row[task_col], assignee))
+                line_index = {}
+                for line_num, orig_line in enumerate(lines_list):
+                    if '|' not in orig_line:
+                        continue
+                    for row_id, assignee_prefix in row_keys:
+                        if (row_id not in line_index and row_id in orig_line
+                                and assignee_prefix in orig_line):
+                            line_index[row_id] = line_num
+
                 for row in cleaned_lines[1:]:  # Skip header
                     # Skip separator lines
-                    if all(part.strip().replace('-', '').replace(':', '').strip() == '' for part in row):
+                    if all(not part.translate(_SEP_TABLE) for part in row):
                         continue
                     
                     # Ensure we have enough columns
@@ -255,72 +493,50 @@ def parse_sprint_plan_output(plan_text: str) -> tuple:
                         if reasoning_col is not None and reasoning_col < len(row):
                             reasoning_text = row[reasoning_col]
                         
-                        # Look for continuation of reasoning in subsequent lines
-                        # Find the line number of this row in original text
-                        for line_num, orig_line in enumerate(lines_list):
-                            if task_id_val in orig_line and '|' in orig_line and assignee_val[:10] in orig_line:
-                                # Found the row, check next few lines for reasoning continuation
-                                reasoning_lines = []
-                                for next_line_num in range(line_num + 1, min(line_num + 15, len(lines_list))):
-                                    next_line = lines_list[next_line_num].strip()
-                                    # Stop if we hit another table row with task ID pattern
-                                    if '|' in next_line:
-                                        # Check if it's a new task row (has task ID pattern)
-                                        if any(pattern in next_line.lower() for pattern in ['s1-t', 's2-t', 's3-t', 's4-t', 's5-t', 't-']):
+                        # Look for continuation of reasoning in subsequent
+                        # lines, starting from the row's indexed table line
+                        line_num = line_index.get(task_id_val)
+                        if line_num is not None:
+                            reasoning_lines = []
+                            for next_line_num in range(line_num + 1, min(line_num + 15, len(lines_list))):
+                                next_line = lines_list[next_line_num].strip()
+                                # Stop if we hit another table row with task ID pattern
+                                if '|' in next_line:
+                                    # Check if it's a new task row (has task ID pattern)
+                                    if _NEW_ROW_RE.search(next_line):
+                                        break
+                                # Collect reasoning text
+                                if next_line and not next_line.startswith('|'):
+                                    if any(keyword in next_line for keyword in ['**Assignment:**', '**Estimate:**', '**Risk:**', 'Assignment:', 'Estimate:', 'Risk:']):
+                                        reasoning_lines.append(next_line)
+                                    elif len(reasoning_lines) > 0 and next_line:  # Continue if we're already collecting
+                                        # Stop if we hit a new section or too much text
+                                        if len(reasoning_lines) > 5:  # Limit reasoning length
                                             break
-                                    # Collect reasoning text
-                                    if next_line and not next_line.startswith('|'):
-                                        if any(keyword in next_line for keyword in ['**Assignment:**', '**Estimate:**', '**Risk:**', 'Assignment:', 'Estimate:', 'Risk:']):
-                                            reasoning_lines.append(next_line)
-                                        elif len(reasoning_lines) > 0 and next_line:  # Continue if we're already collecting
-                                            # Stop if we hit a new section or too much text
-                                            if len(reasoning_lines) > 5:  # Limit reasoning length
-                                                break
-                                            reasoning_lines.append(next_line)
-                                        elif not reasoning_lines and len(next_line) > 50:  # Long line might be reasoning start
-                                            reasoning_lines.append(next_line)
-                                if reasoning_lines:
-                                    reasoning_text = (reasoning_text + " " + " ".join(reasoning_lines)).strip()
-                                break
+                                        reasoning_lines.append(next_line)
+                                    elif not reasoning_lines and len(next_line) > 50:  # Long line might be reasoning start
+                                        reasoning_lines.append(next_line)
+                            if reasoning_lines:
+                                reasoning_text = (reasoning_text + " " + " ".join(reasoning_lines)).strip()
                         
-                        assignment = {
-                            "Task_ID": task_id_val,
-                            "Assignee": assignee_val,
-                            "Estimated_Hours": hours_val,
-                            "Risk_Level": risk_val,
-                            "Reasoning_Trace": reasoning_text if reasoning_text else "See full report"
-                        }
                         # Only add if we have at least Task_ID and Assignee
-                        if assignment["Task_ID"] != "N/A" and assignment["Assignee"] != "N/A":
-                            task_assignments.append(assignment)
+                        if task_id_val != "N/A" and assignee_val != "N/A":
+                            ids.append(task_id_val)
+                            assignees.append(assignee_val)
+                            hours.append(hours_val)
+                            risks.append(risk_val)
+                            traces.append(reasoning_text if reasoning_text else "See full report")
         except Exception:
             pass
     
     # Alternative: Try to extract structured data from text patterns
-    if not task_assignments:
+    if not ids:
         # Look for patterns like "Task T-101: Assignee: John, Hours: 8, Risk: Low"
-        pattern = r'(?:Task[_\s]*(?:ID)?[:\s]*)?([T\-]?\d+|[A-Z]+\-\d+)[:\s]+(?:Assignee[:\s]+)?([A-Za-z\s]+?)(?:[,\s]+Hours?[:\s]+)?(\d+)?(?:[,\s]+Risk[:\s]+)?([A-Za-z]+)?'
-        matches = re.finditer(pattern, plan_text, re.IGNORECASE | re.MULTILINE)
-        
-        for match in matches:
-            task_id = match.group(1) if match.group(1) else "N/A"
-            assignee = match.group(2).strip() if match.group(2) else "N/A"
-            hours = match.group(3) if match.group(3) else "N/A"
-            risk = match.group(4) if match.group(4) else "N/A"
-            
-            task_assignments.append({
-                "Task_ID": task_id,
-                "Assignee": assignee,
-                "Estimated_Hours": hours,
-                "Risk_Level": risk,
-                "Reasoning_Trace": "See full report below"
-            })
-    
-    # Create DataFrame
-    if task_assignments:
-        df = pd.DataFrame(task_assignments)
-    else:
-        # Create empty DataFrame with expected columns
-        df = pd.DataFrame(columns=["Task_ID", "Assignee", "Estimated_Hours", "Risk_Level", "Reasoning_Trace"])
-    
-    return df, plan_text
+        for match in _PLAN_FALLBACK_RE.finditer(plan_text):
+            ids.append(match.group(1) if match.group(1) else "N/A")
+            assignees.append(match.group(2).strip() if match.group(2) else "N/A")
+            hours.append(match.group(3) if match.group(3) else "N/A")
+            risks.append(match.group(4) if match.group(4) else "N/A")
+            traces.append("See full report below")
+
+    return tuple(ids), tuple(assignees), tuple(hours), tuple(risks), tuple(traces)